@@ -0,0 +1,248 @@
+'''Benchmarks for the student store and the tax / SIP engines.
+Synthetic students and employees are generated from a fixed seed, so runs are comparable.
+Every case records operations per second, p50/p99 latency per operation and peak traced memory,
+and the results are written as JSON. Passing an earlier result file with --compare prints the
+change for every case and flags slowdowns beyond --threshold.
+
+Usage: python benchmark.py [--students N] [--employees N] [--output FILE] [--compare FILE]'''
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import finance_engine as fe
+from student_columns import ColumnarStudents
+from student_store import StudentStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SECTIONS = 'ABCDEFGH'
+FIRST_NAMES = ('Aarav', 'Rohan', 'Karan', 'Anjali', 'Neha', 'Aditya', 'Priya', 'Rahul', 'Sonal', 'Vikas')
+LAST_NAMES = ('Sharma', 'Mehta', 'Singh', 'Patel', 'Gupta', 'Nair', 'Verma', 'Iyer', 'Rao', 'Reddy')
+
+
+def generate_students(n, seed=0):
+    rnd = random.Random(seed)
+    for i in range(n):
+        s = {"Name": f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}", "ID": f"S{i:08d}",
+             "Section": rnd.choice(SECTIONS)}
+        for sub in ('Sub1', 'Sub2', 'Sub3', 'Sub4', 'Sub5'):
+            s[sub] = rnd.randrange(101)
+        yield s
+
+
+def generate_employees(n, seed=0):
+    rnd = random.Random(seed)
+    return {
+        "annual_income": [rnd.randrange(200000, 6000000) for _ in range(n)],
+        "deductions_80C": [rnd.randrange(0, 150001) for _ in range(n)],
+        "deductions_80D": [rnd.randrange(0, 50001) for _ in range(n)],
+        "monthly_sip": [rnd.randrange(500, 50001) for _ in range(n)],
+        "return_pct": [rnd.choice((0, 6, 8, 10, 12, 15)) for _ in range(n)],
+        "step_up_pct": [rnd.choice((0, 5, 10)) for _ in range(n)],
+    }
+
+
+def measure(state, op, ops, items_per_op=1, reset=None, trace_ops=1000):
+    # op(state, i) is timed `ops` times one by one. Cases share one state, so
+    # reset(state), if given, undoes the operations afterwards (untimed).
+    latencies = []
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for i in range(ops):
+            t = time.perf_counter_ns()
+            op(state, i)
+            latencies.append(time.perf_counter_ns() - t)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    if reset is not None:
+        reset(state)
+
+    # Separate pass for the memory the operations allocate, since tracing
+    # slows everything down.
+    peak = None
+    if trace_ops:
+        gc.collect()
+        tracemalloc.start()
+        for i in range(min(ops, trace_ops)):
+            op(state, i)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if reset is not None:
+            reset(state)
+
+    latencies.sort()
+    return {
+        "ops": ops,
+        "ops_per_second": ops / elapsed if elapsed else None,
+        "items_per_second": ops * items_per_op / elapsed if elapsed else None,
+        "p50_us": latencies[len(latencies) // 2] / 1000,
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1000,
+        "peak_memory_mb": None if peak is None else peak / 2 ** 20,
+    }
+
+
+def student_cases(n, ops, seed):
+    # One store is built per run and shared by every case; each mutating
+    # case puts the students it touched back afterwards.
+    rnd = random.Random(seed + 1)
+    ops = min(ops, n)
+    ids = [f"S{i:08d}" for i in rnd.sample(range(n), ops)]
+
+    built = []
+    build = measure(built, lambda built, i: built.append(StudentStore(generate_students(n, seed))), 1,
+                    items_per_op=n, trace_ops=0)
+    store = built.pop()
+    originals = {student_id: dict(store.get(student_id)) for student_id in ids}
+
+    def add(store, i):
+        store.add({"Name": "Bench Student", "ID": f"N{i:08d}", "Section": "A",
+                   "Sub1": 50, "Sub2": 60, "Sub3": 70, "Sub4": 80, "Sub5": 90})
+
+    def remove_added(store):
+        for i in range(ops):
+            store.delete(f"N{i:08d}")
+
+    def update(store, i):
+        store.update(ids[i], Sub1=i % 101)
+
+    def restore_marks(store):
+        for student_id, s in originals.items():
+            store.update(student_id, Sub1=s['Sub1'])
+
+    def delete(store, i):
+        store.delete(ids[i])
+
+    def restore_deleted(store):
+        for student_id, s in originals.items():
+            if student_id not in store:
+                store.add(dict(s))
+
+    def aggregate(store, i):
+        store.section_stats(SECTIONS[i % len(SECTIONS)])
+        store.school_stats()
+
+    def rank(store, i):
+        store.rank(ids[i], within_section=True)
+        store.percentile(ids[i])
+
+    cases = {
+        "student_build": build,
+        "student_lookup": measure(store, lambda store, i: store.get(ids[i]), ops),
+        "student_add": measure(store, add, ops, reset=remove_added),
+        "student_update": measure(store, update, ops, reset=restore_marks),
+        "student_delete": measure(store, delete, ops, reset=restore_deleted),
+        "student_aggregate": measure(store, aggregate, ops),
+        "student_rank": measure(store, rank, ops),
+        "student_top10": measure(store, lambda store, i: store.top(10, SECTIONS[i % len(SECTIONS)]), ops),
+    }
+
+    ids_column, names, sections, marks = [], [], [], []
+    for s in store:
+        ids_column.append(s['ID'])
+        names.append(s['Name'])
+        sections.append(s['Section'])
+        marks.extend(s[sub] for sub in ('Sub1', 'Sub2', 'Sub3', 'Sub4', 'Sub5'))
+    del store
+    columns = []
+    cases["columnar_build"] = measure(
+        columns, lambda columns, i: columns.append(ColumnarStudents.from_arrays(ids_column, names, sections, marks)),
+        1, items_per_op=n, trace_ops=0)
+    cases["columnar_statistics"] = measure(columns[0], lambda columns, i: (columns.subject_stats(),
+                                                                        columns.section_toppers()),
+                                           3, items_per_op=n)
+    return cases
+
+
+def engine_cases(n, ops, seed):
+    employees = generate_employees(n, seed)
+    incomes = employees["annual_income"]
+    if np is not None:
+        employees = {key: np.asarray(values) for key, values in employees.items()}
+
+    def batch_tax(e, i):
+        fe.calculate_old_regime_tax_batch(e["annual_income"], e["deductions_80C"], e["deductions_80D"])
+        fe.calculate_new_regime_tax_batch(e["annual_income"])
+
+    def scalar_tax(_, i):
+        income = incomes[i % len(incomes)]
+        fe.calculate_old_regime_tax(income, 150000, 50000)
+        fe.calculate_new_regime_tax(income)
+
+    def sip_projection(e, i):
+        fe.project_sip_batch(e["monthly_sip"], e["return_pct"], 20, e["step_up_pct"])
+
+    return {
+        "tax_scalar": measure(None, scalar_tax, ops),
+        "tax_batch": measure(employees, batch_tax, 5, items_per_op=n),
+        "sip_projection_batch": measure(employees, sip_projection, 3, items_per_op=n),
+    }
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, case in results["cases"].items():
+        old = baseline.get("cases", {}).get(name)
+        if not old or not old.get("ops_per_second") or not case.get("ops_per_second"):
+            continue
+        change = case["ops_per_second"] / old["ops_per_second"] - 1
+        flag = "  REGRESSION" if change < -threshold else ""
+        print(f"{name:24s} {old['ops_per_second']:>14,.0f} -> {case['ops_per_second']:>14,.0f} ops/s "
+              f"({change * 100:+.1f}%){flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--students", type=int, default=100000, help="students in the store (up to 10M)")
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--ops", type=int, default=10000, help="timed operations per student case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+    for name in ("students", "employees", "ops"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name} must be at least 1")
+
+    results = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "numpy": np.__version__ if np is not None else None},
+        "parameters": {"students": args.students, "employees": args.employees,
+                       "ops": args.ops, "seed": args.seed},
+        "cases": {},
+    }
+    results["cases"].update(student_cases(args.students, args.ops, args.seed))
+    results["cases"].update(engine_cases(args.employees, args.ops, args.seed))
+
+    for name, case in results["cases"].items():
+        peak = "-" if case['peak_memory_mb'] is None else f"{case['peak_memory_mb']:.1f}"
+        print(f"{name:24s} {case['ops_per_second']:>14,.0f} ops/s  p50 {case['p50_us']:>10.2f}us  "
+              f"p99 {case['p99_us']:>10.2f}us  peak {peak:>8s}MB")
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+'''Tax and SIP calculations behind the personal finance calculator.
+Importing this module reads no input and loads nothing heavy; NumPy is only imported the first
+time a batch function runs, so worker processes and services can import it cheaply.'''
+
+from bisect import bisect_left
+from functools import lru_cache
+
+from lazy_numpy import get_numpy
+
+def calculate_old_regime_tax(annual_income, deductions_80C=0, deductions_80D=0):
+    taxable_income = max(0, annual_income - deductions_80C - deductions_80D)
+    tax = 0.0
+
+    if taxable_income <= 250000:
+        tax = 0
+    elif taxable_income <= 500000:
+        tax = (taxable_income - 250000) * 0.05
+    elif taxable_income <= 1000000:
+        tax = (250000 * 0.05) + (taxable_income - 500000) * 0.20
+    else:
+        tax = (250000 * 0.05) + (500000 * 0.20) + (taxable_income - 1000000) * 0.30
+
+    if taxable_income <= 500000:
+        tax = 0.0
+    else:
+        tax += tax * 0.04  # health & education cess
+
+    return tax, taxable_income
+
+def calculate_new_regime_tax(annual_income):
+    taxable_income = annual_income
+    tax = 0.0
+
+    if taxable_income <= 400000:
+        tax = 0
+    elif taxable_income <= 800000:
+        tax = (taxable_income - 400000) * 0.05
+    elif taxable_income <= 1200000:
+        tax = (400000 * 0.05) + (taxable_income - 800000) * 0.10
+    elif taxable_income <= 1600000:
+        tax = (400000 * 0.05) + (400000 * 0.10) + (taxable_income - 1200000) * 0.15
+    elif taxable_income <= 2000000:
+        tax = (400000 * 0.05) + (400000 * 0.10) + (400000 * 0.15) + (taxable_income - 1600000) * 0.20
+    elif taxable_income <= 2400000:
+        tax = (400000 * 0.05) + (400000 * 0.10) + (400000 * 0.15) + (400000 * 0.20) + (taxable_income - 2000000) * 0.25
+    else:
+        tax = (400000 * 0.05) + (400000 * 0.10) + (400000 * 0.15) + (400000 * 0.20) + (400000 * 0.25) + (taxable_income - 2400000) * 0.30
+
+    if taxable_income <= 1200000:
+        tax = 0.0
+    else:
+        tax += tax * 0.04  # cess
+
+    return tax, taxable_income
+
+# Slab tables: (lower bound, rate) for each slab, lowest first. The tax on
+# every slab below the current one is precomputed once into a cumulative
+# base, so the batch functions only need one lookup per income.
+OLD_REGIME_SLABS = ((0, 0.0), (250000, 0.05), (500000, 0.20), (1000000, 0.30))
+NEW_REGIME_SLABS = ((0, 0.0), (400000, 0.05), (800000, 0.10), (1200000, 0.15),
+                    (1600000, 0.20), (2000000, 0.25), (2400000, 0.30))
+OLD_REGIME_REBATE_LIMIT = 500000
+NEW_REGIME_REBATE_LIMIT = 1200000
+CESS_RATE = 0.04
+
+
+def slab_bases(slabs):
+    # Summed left to right, in the same order as the scalar functions, so the
+    # batch results match them to the last bit.
+    bases = [0.0, 0.0]
+    for (lower, rate), (upper, _) in zip(slabs[1:], slabs[2:]):
+        bases.append(bases[-1] + (upper - lower) * rate)
+    return bases[:len(slabs)]
+
+
+OLD_REGIME_BASES = slab_bases(OLD_REGIME_SLABS)
+NEW_REGIME_BASES = slab_bases(NEW_REGIME_SLABS)
+
+
+def calculate_slab_tax(taxable_income, slabs, bases, rebate_limit):
+    if taxable_income <= rebate_limit:
+        return 0.0
+    slab = max(bisect_left([lower for lower, _ in slabs], taxable_income) - 1, 0)
+    lower, rate = slabs[slab]
+    tax = bases[slab] + (taxable_income - lower) * rate
+    return tax + tax * CESS_RATE
+
+
+def calculate_slab_tax_batch(taxable_incomes, slabs, bases, rebate_limit):
+    np = get_numpy()
+    if np is not None:
+        taxable = np.asarray(taxable_incomes, dtype=np.float64)
+        lowers = np.asarray([lower for lower, _ in slabs], dtype=np.float64)
+        rates = np.asarray([rate for _, rate in slabs], dtype=np.float64)
+        bases = np.asarray(bases, dtype=np.float64)
+        slab = np.maximum(np.searchsorted(lowers, taxable, side='left') - 1, 0)
+        tax = bases[slab] + (taxable - lowers[slab]) * rates[slab]
+        return np.where(taxable <= rebate_limit, 0.0, tax + tax * CESS_RATE)
+
+    return [calculate_slab_tax(taxable, slabs, bases, rebate_limit) for taxable in taxable_incomes]
+
+
+def calculate_old_regime_tax_batch(annual_incomes, deductions_80C=0, deductions_80D=0):
+    # Vectorised calculate_old_regime_tax: incomes and deductions may be
+    # arrays (or scalars broadcast to every employee). Returns (tax, taxable).
+    np = get_numpy()
+    if np is not None:
+        taxable = np.maximum(0, np.asarray(annual_incomes, dtype=np.float64) - deductions_80C - deductions_80D)
+    else:
+        n = len(annual_incomes)
+        d80c = deductions_80C if isinstance(deductions_80C, (list, tuple)) else [deductions_80C] * n
+        d80d = deductions_80D if isinstance(deductions_80D, (list, tuple)) else [deductions_80D] * n
+        taxable = [max(0, income - c - d) for income, c, d in zip(annual_incomes, d80c, d80d)]
+    tax = calculate_slab_tax_batch(taxable, OLD_REGIME_SLABS, OLD_REGIME_BASES, OLD_REGIME_REBATE_LIMIT)
+    return tax, taxable
+
+
+def calculate_new_regime_tax_batch(annual_incomes):
+    np = get_numpy()
+    if np is not None:
+        taxable = np.asarray(annual_incomes, dtype=np.float64)
+    else:
+        taxable = list(annual_incomes)
+    tax = calculate_slab_tax_batch(taxable, NEW_REGIME_SLABS, NEW_REGIME_BASES, NEW_REGIME_REBATE_LIMIT)
+    return tax, taxable
+
+
+@lru_cache(maxsize=1024)
+def monthly_return_rate(annual_return_rate_pct):
+    r = annual_return_rate_pct / 100.0
+    return (1 + r) ** (1/12) - 1
+
+@lru_cache(maxsize=1024)
+def sip_year_factors(annual_return_rate_pct):
+    # (growth of the existing corpus over 12 months,
+    #  year-end value of 12 monthly instalments of 1)
+    monthly_rate = monthly_return_rate(annual_return_rate_pct)
+    if monthly_rate == 0:
+        return 1.0, 12.0
+    growth = (1 + monthly_rate) ** 12
+    return growth, ((growth - 1) / monthly_rate) * (1 + monthly_rate)
+
+def next_sip_corpus(corpus, monthly_sip, annual_return_rate_pct):
+    # Carries a corpus forward by one year of monthly SIPs.
+    growth, instalments = sip_year_factors(annual_return_rate_pct)
+    return corpus * growth + monthly_sip * instalments
+
+def project_sip(monthly_sip, annual_return_rate_pct, years, step_up_pct=0):
+    # Year-by-year schedule. annual_return_rate_pct may be one rate or a
+    # list with one rate per year; the SIP grows by step_up_pct every year.
+    rates = annual_return_rate_pct if isinstance(annual_return_rate_pct, (list, tuple)) else [annual_return_rate_pct] * years
+    schedule = []
+    corpus = total_invested = 0.0
+    for year in range(1, years + 1):
+        if year > 1:
+            monthly_sip *= (1 + step_up_pct / 100)
+        corpus = next_sip_corpus(corpus, monthly_sip, rates[year - 1])
+        total_invested += monthly_sip * 12
+        schedule.append({"year": year, "monthly_sip": monthly_sip,
+                         "total_invested": total_invested, "corpus": corpus})
+    return schedule
+
+def project_sip_batch(monthly_sips, annual_return_rate_pcts, years, step_up_pcts=0):
+    # project_sip for many investors at once. Rates may be a scalar, one per
+    # investor, or an investors x years grid. Returns (corpus, invested) as
+    # investors x years arrays (lists of lists without NumPy).
+    np = get_numpy()
+    if np is None:
+        n = len(monthly_sips)
+        rates = annual_return_rate_pcts
+        if not isinstance(rates, (list, tuple)):
+            rates = [rates] * n
+        step_ups = step_up_pcts if isinstance(step_up_pcts, (list, tuple)) else [step_up_pcts] * n
+        corpus, invested = [], []
+        for sip, rate, step_up in zip(monthly_sips, rates, step_ups):
+            schedule = project_sip(sip, list(rate) if isinstance(rate, (list, tuple)) else rate, years, step_up)
+            corpus.append([row["corpus"] for row in schedule])
+            invested.append([row["total_invested"] for row in schedule])
+        return corpus, invested
+
+    sips = np.asarray(monthly_sips, dtype=np.float64)
+    n = len(sips)
+    rates = np.asarray(annual_return_rate_pcts, dtype=np.float64)
+    rates = np.broadcast_to(rates.reshape(n, years) if rates.ndim == 2 else rates.reshape(-1, 1), (n, years))
+    step_ups = np.broadcast_to(np.asarray(step_up_pcts, dtype=np.float64), (n,))
+
+    monthly_rates = (1 + rates / 100.0) ** (1/12) - 1
+    growth = (1 + monthly_rates) ** 12
+    safe_rates = np.where(monthly_rates == 0, 1.0, monthly_rates)
+    instalments = np.where(monthly_rates == 0, 12.0, ((growth - 1) / safe_rates) * (1 + monthly_rates))
+
+    corpus = np.empty((n, years))
+    invested = np.empty((n, years))
+    current = np.zeros(n)
+    total = np.zeros(n)
+    for year in range(years):
+        if year > 0:
+            sips = sips * (1 + step_ups / 100)
+        current = current * growth[:, year] + sips * instalments[:, year]
+        total = total + sips * 12
+        corpus[:, year] = current
+        invested[:, year] = total
+    return corpus, invested
+
+def calculate_sip_end_value(monthly_sip, annual_return_rate_pct, duration_years):
+    monthly_rate = monthly_return_rate(annual_return_rate_pct)
+    months = duration_years * 12
+    if monthly_rate == 0:
+        return monthly_sip * months
+    corpus = monthly_sip * (((1 + monthly_rate) ** months - 1) / monthly_rate) * (1 + monthly_rate)
+    return corpus
+
+def yearly_summary(monthly_salary, pf_percent, deductions_80C, deductions_80D,
+                   monthly_expenses, monthly_sip, expected_return_pct, year,
+                   sip_corpus=None, total_invested=None, old_regime=None, new_regime=None):
+    # old_regime / new_regime: (tax, taxable income) already worked out, e.g.
+    # by the batch tax functions; computed here when not given.
+    if sip_corpus is None:
+        sip_corpus = calculate_sip_end_value(monthly_sip, expected_return_pct, year)
+    if total_invested is None:
+        total_invested = monthly_sip * 12 * year
+
+    annual_salary = monthly_salary * 12
+    annual_expenses = monthly_expenses * 12
+    pf_contribution = annual_salary * pf_percent / 100
+    annual_savings_before_tax = annual_salary - annual_expenses - pf_contribution
+
+    if old_regime is None:
+        old_regime = calculate_old_regime_tax(annual_salary, deductions_80C, deductions_80D)
+    if new_regime is None:
+        new_regime = calculate_new_regime_tax(annual_salary)
+    old_tax, old_taxable_income = old_regime
+    new_tax, new_taxable_income = new_regime
+
+    inhand_old_annual = annual_salary - old_tax - pf_contribution - annual_expenses
+    inhand_new_annual = annual_salary - new_tax - pf_contribution - annual_expenses
+
+    return {
+        "year": year,
+        "annual_salary": annual_salary,
+        "annual_expenses": annual_expenses,
+        "pf_contribution": pf_contribution,
+        "annual_savings_before_tax": annual_savings_before_tax,
+        "old_taxable_income": old_taxable_income,
+        "old_tax": old_tax,
+        "inhand_old_annual": inhand_old_annual,
+        "new_taxable_income": new_taxable_income,
+        "new_tax": new_tax,
+        "inhand_new_annual": inhand_new_annual,
+        "recommended_regime": recommended_regime(inhand_old_annual, inhand_new_annual),
+        "total_invested": total_invested,
+        "sip_corpus": sip_corpus,
+    }
+
+def recommended_regime(inhand_old_annual, inhand_new_annual):
+    if inhand_new_annual > inhand_old_annual:
+        return "new"
+    if inhand_old_annual > inhand_new_annual:
+        return "old"
+    return "either"
@@ -0,0 +1,13 @@
+'''NumPy is optional and slow to import, so modules that only need it for batch work fetch it
+through get_numpy() on first use instead of importing it at start-up.'''
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
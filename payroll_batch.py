@@ -0,0 +1,207 @@
+'''Non-interactive payroll runner for the yearly finance calculation.
+Reads an employee file (CSV or JSONL), projects every employee over their hike schedule with
+the same rules as run_yearly_finance_calculation() (old vs new regime, in-hand income and SIP
+corpus per year) and streams one result row per employee-year to CSV or JSONL.
+Employees are processed in chunks across a process pool, and each chunk's taxes are computed
+with the batch tax functions in one call per regime.
+
+Input columns: employee_id, monthly_salary, pf_percent, deductions_80C, deductions_80D,
+monthly_sip, expected_return_pct, and optionally monthly_expenses, years, hike_pct
+(semicolon-separated hikes for years 2, 3, ...; the last one repeats) and sip_step_up_pct.
+
+Usage: python payroll_batch.py employees.csv results.csv [--workers N] [--chunk-size N]'''
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from finance_engine import (calculate_new_regime_tax_batch, calculate_old_regime_tax_batch,
+                            next_sip_corpus, yearly_summary)
+
+MAX_80C = 150000
+MAX_80D = 50000
+
+OUTPUT_FIELDS = (
+    "employee_id", "year", "annual_salary", "annual_expenses", "pf_contribution",
+    "annual_savings_before_tax", "old_taxable_income", "old_tax", "inhand_old_annual",
+    "new_taxable_income", "new_tax", "inhand_new_annual", "recommended_regime",
+    "total_invested", "sip_corpus",
+)
+
+
+def file_format(path):
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def read_employees(path, errors=None):
+    # Streams parsed employees; rows that cannot be parsed are skipped and
+    # recorded in `errors` as (line_number, reason).
+    with open(path, newline='', encoding='utf-8') as f:
+        if file_format(path) == 'csv':
+            reader = csv.DictReader(f)
+            rows = ((reader.line_num, row) for row in reader)
+        else:
+            rows = ((n, line) for n, line in enumerate(f, 1) if line.strip())
+        for line_no, row in rows:
+            try:
+                yield parse_employee(json.loads(row) if isinstance(row, str) else row)
+            except (KeyError, TypeError, ValueError) as e:
+                if errors is not None:
+                    errors.append((line_no, f"{type(e).__name__}: {e}"))
+
+
+def _number(row, field, default=None):
+    value = row.get(field)
+    if value is None or value == '':
+        if default is None:
+            raise KeyError(field)
+        return default
+    return float(value)
+
+
+def parse_employee(row):
+    if not isinstance(row, dict):
+        raise TypeError(f"expected an object, got {type(row).__name__}")
+    hikes = row.get('hike_pct') or []
+    if isinstance(hikes, str):
+        hikes = [float(h) for h in hikes.split(';') if h.strip()]
+    elif not isinstance(hikes, list):
+        hikes = [float(hikes)]
+    years = int(_number(row, 'years', len(hikes) + 1))
+    if years < 1:
+        raise ValueError("years must be at least 1")
+    return {
+        "employee_id": str(row['employee_id']),
+        "monthly_salary": _number(row, 'monthly_salary'),
+        "pf_percent": _number(row, 'pf_percent', 0),
+        "deductions_80C": min(_number(row, 'deductions_80C', 0), MAX_80C),
+        "deductions_80D": min(_number(row, 'deductions_80D', 0), MAX_80D),
+        "monthly_sip": _number(row, 'monthly_sip', 0),
+        "sip_step_up_pct": _number(row, 'sip_step_up_pct', 0),
+        "expected_return_pct": _number(row, 'expected_return_pct', 0),
+        "monthly_expenses": _number(row, 'monthly_expenses', 0),
+        "years": years,
+        "hikes": [float(h) for h in hikes],
+    }
+
+
+def project_chunk(employees):
+    # Every (employee, year) in the chunk, with both regimes' taxes computed
+    # in one batch call each.
+    plan = []
+    for e in employees:
+        monthly_salary = e["monthly_salary"]
+        monthly_sip = e["monthly_sip"]
+        sip_corpus = total_invested = 0.0
+        for year in range(1, e["years"] + 1):
+            if year > 1:
+                if e["hikes"]:
+                    hike_pct = e["hikes"][min(year - 2, len(e["hikes"]) - 1)]
+                    monthly_salary *= (1 + hike_pct / 100)
+                monthly_sip *= (1 + e["sip_step_up_pct"] / 100)
+            sip_corpus = next_sip_corpus(sip_corpus, monthly_sip, e["expected_return_pct"])
+            total_invested += monthly_sip * 12
+            plan.append((e, year, monthly_salary, monthly_sip, sip_corpus, total_invested))
+    if not plan:
+        return []
+
+    annual_salaries = [step[2] * 12 for step in plan]
+    old_taxes, old_taxables = calculate_old_regime_tax_batch(
+        annual_salaries, [step[0]["deductions_80C"] for step in plan], [step[0]["deductions_80D"] for step in plan])
+    new_taxes, new_taxables = calculate_new_regime_tax_batch(annual_salaries)
+
+    rows = []
+    for i, (e, year, monthly_salary, monthly_sip, sip_corpus, total_invested) in enumerate(plan):
+        summary = yearly_summary(monthly_salary, e["pf_percent"], e["deductions_80C"], e["deductions_80D"],
+                                 e["monthly_expenses"], monthly_sip, e["expected_return_pct"], year,
+                                 sip_corpus, total_invested,
+                                 old_regime=(float(old_taxes[i]), float(old_taxables[i])),
+                                 new_regime=(float(new_taxes[i]), float(new_taxables[i])))
+        rows.append({"employee_id": e["employee_id"], **summary})
+    return rows
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def format_rows(rows, fmt):
+    if fmt == 'csv':
+        out = io.StringIO()
+        csv.DictWriter(out, fieldnames=OUTPUT_FIELDS).writerows(rows)
+        return out.getvalue()
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+def project_chunk_text(employees, fmt):
+    # Formatting happens in the worker too, so the parent process only has
+    # to write finished text.
+    rows = project_chunk(employees)
+    return len(rows), format_rows(rows, fmt)
+
+
+def _run_chunks(task, employees, workers, chunk_size):
+    # Yields task(chunk) results in input order. At most two chunks per
+    # worker are in flight, so memory stays bounded however large the input is.
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(employees, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield task(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(task, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_batch(input_path, output_path, workers=None, chunk_size=1000):
+    errors = []
+    fmt = file_format(output_path)
+    task = partial(project_chunk_text, fmt=fmt)
+    count = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            csv.DictWriter(f, fieldnames=OUTPUT_FIELDS).writeheader()
+        for n, text in _run_chunks(task, read_employees(input_path, errors), workers, chunk_size):
+            f.write(text)
+            count += n
+    return count, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yearly finance calculation for a whole employee file.")
+    parser.add_argument("input", help="employee file (.csv or .jsonl)")
+    parser.add_argument("output", help="result file (.csv or .jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="employees per task")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count, errors = run_batch(args.input, args.output, args.workers, args.chunk_size)
+    for line_no, reason in errors:
+        print(f"line {line_no}: {reason}", file=sys.stderr)
+    print(f"Wrote {count} rows to {args.output} in {time.perf_counter() - start:.2f}s "
+          f"({len(errors)} rows skipped).")
+
+
+if __name__ == "__main__":
+    main()
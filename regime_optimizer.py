@@ -0,0 +1,157 @@
+'''Old vs new regime optimizer.
+Instead of comparing the two regimes at one fixed 80C/80D input, this works out, per employee:
+  - the deductions that minimise old-regime tax within the 80C (₹1,50,000) and 80D (₹50,000) caps,
+  - the smallest total deduction at which the old regime stops costing more than the new one,
+  - the incomes at which the better regime switches for those deductions (break-even points).
+All three come straight from the slab tables: taxes are piecewise linear in income, so each
+answer is found by inverting a slab formula or solving one linear equation per slab interval.
+Recent results are memoized on (income, deductions) in a bounded cache, so repeated salaries
+across an organisation cost one dictionary lookup.
+
+Usage: python regime_optimizer.py employees.csv [results.csv]'''
+
+import csv
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+
+from finance_engine import (CESS_RATE, NEW_REGIME_BASES, NEW_REGIME_REBATE_LIMIT, NEW_REGIME_SLABS,
+                            OLD_REGIME_BASES, OLD_REGIME_REBATE_LIMIT, OLD_REGIME_SLABS,
+                            calculate_slab_tax)
+
+MAX_80C = 150000
+MAX_80D = 50000
+
+OUTPUT_FIELDS = ("employee_id", "annual_income", "deductions_80C", "deductions_80D", "old_tax", "new_tax",
+                 "best_regime", "tax_saving", "min_deductions_for_old", "breakeven_incomes")
+
+
+def old_regime_tax(annual_income, deductions):
+    taxable = max(0, annual_income - deductions)
+    return calculate_slab_tax(taxable, OLD_REGIME_SLABS, OLD_REGIME_BASES, OLD_REGIME_REBATE_LIMIT)
+
+
+def new_regime_tax(annual_income):
+    return calculate_slab_tax(annual_income, NEW_REGIME_SLABS, NEW_REGIME_BASES, NEW_REGIME_REBATE_LIMIT)
+
+
+def max_taxable_for_tax(target_tax, slabs, bases, rebate_limit):
+    # Largest taxable income whose tax does not exceed target_tax, found by
+    # inverting the slab formula (tax is non-decreasing in taxable income).
+    slab = bisect_right([lower for lower, _ in slabs], rebate_limit) - 1
+    lower, rate = slabs[slab]
+    tax_above_rebate = (bases[slab] + (rebate_limit - lower) * rate) * (1 + CESS_RATE)
+    if target_tax < tax_above_rebate:
+        return rebate_limit
+    before_cess = target_tax / (1 + CESS_RATE)
+    slab = bisect_right(bases, before_cess) - 1
+    lower, rate = slabs[slab]
+    return lower + (before_cess - bases[slab]) / rate
+
+
+@lru_cache(maxsize=1024)
+def breakeven_incomes(deductions):
+    # Incomes at which the cheaper regime changes, for a fixed total of
+    # old-regime deductions. Between consecutive slab boundaries (of either
+    # regime, old ones shifted by the deductions) both taxes are linear, so
+    # each interval holds at most one crossing; the rebates can also flip
+    # the answer exactly at a boundary.
+    boundaries = sorted({0.0, *(lower + deductions for lower, _ in OLD_REGIME_SLABS),
+                         OLD_REGIME_REBATE_LIMIT + deductions, NEW_REGIME_REBATE_LIMIT,
+                         *(lower for lower, _ in NEW_REGIME_SLABS)})
+
+    def gap(income):
+        return old_regime_tax(income, deductions) - new_regime_tax(income)
+
+    def sign(value):
+        return (value > 1e-6) - (value < -1e-6)
+
+    # (start, sign of old - new from there on) for every linear piece
+    pieces = []
+    for a, b in zip(boundaries, boundaries[1:]):
+        midpoint = (a + b) / 2
+        slope = (gap(b) - gap(midpoint)) / (b - midpoint)
+        root = b - gap(b) / slope if slope else None
+        if root is not None and a < root < b:
+            pieces.append((a, sign(gap((a + root) / 2))))
+            pieces.append((root, sign(gap((root + b) / 2))))
+        else:
+            pieces.append((a, sign(gap(midpoint))))
+    pieces.append((boundaries[-1], sign(gap(boundaries[-1] + 1))))
+
+    switches = []
+    current = 0
+    for start, piece_sign in pieces:
+        if piece_sign and piece_sign != current:
+            if current:
+                switches.append(start)
+            current = piece_sign
+    return tuple(switches)
+
+
+@lru_cache(maxsize=8192)
+def optimize_regime(annual_income, available_80C=MAX_80C, available_80D=MAX_80D):
+    deductions_80C = min(available_80C, MAX_80C)
+    deductions_80D = min(available_80D, MAX_80D)
+    # Old-regime tax only falls as deductions grow, so the cheapest mix is
+    # simply as much of each as the caps allow.
+    old_tax = old_regime_tax(annual_income, deductions_80C + deductions_80D)
+    new_tax = new_regime_tax(annual_income)
+
+    # Smallest deduction total that brings old-regime tax down to new-regime tax.
+    taxable_needed = max_taxable_for_tax(new_tax, OLD_REGIME_SLABS, OLD_REGIME_BASES, OLD_REGIME_REBATE_LIMIT)
+    needed = max(0.0, annual_income - taxable_needed)
+    if needed > MAX_80C + MAX_80D:
+        needed = None
+
+    if old_tax < new_tax:
+        best = "old"
+    elif new_tax < old_tax:
+        best = "new"
+    else:
+        best = "either"
+    return {
+        "annual_income": annual_income,
+        "deductions_80C": deductions_80C,
+        "deductions_80D": deductions_80D,
+        "old_tax": old_tax,
+        "new_tax": new_tax,
+        "best_regime": best,
+        "tax_saving": abs(old_tax - new_tax),
+        "min_deductions_for_old": needed,
+        "breakeven_incomes": breakeven_incomes(deductions_80C + deductions_80D),
+    }
+
+
+def optimize_employees(employees):
+    # employees: parsed rows as produced by payroll_batch.read_employees.
+    for e in employees:
+        result = dict(optimize_regime(e["monthly_salary"] * 12, e["deductions_80C"], e["deductions_80D"]))
+        result["employee_id"] = e["employee_id"]
+        yield result
+
+
+def main(argv=None):
+    from payroll_batch import read_employees
+
+    args = sys.argv[1:] if argv is None else argv
+    if not 1 <= len(args) <= 2:
+        print(__doc__.rsplit("Usage: ", 1)[1])
+        return
+    errors = []
+    out = open(args[1], 'w', newline='', encoding='utf-8') if len(args) == 2 else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        for result in optimize_employees(read_employees(args[0], errors)):
+            result["breakeven_incomes"] = ";".join(f"{income:.2f}" for income in result["breakeven_incomes"])
+            writer.writerow(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    for line_no, reason in errors:
+        print(f"line {line_no}: {reason}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
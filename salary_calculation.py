@@ -1,57 +1,4 @@
-def calculate_old_regime_tax(annual_income, deductions_80C=0, deductions_80D=0):
-    taxable_income = max(0, annual_income - deductions_80C - deductions_80D)
-    tax = 0.0
-
-    if taxable_income <= 250000:
-        tax = 0
-    elif taxable_income <= 500000:
-        tax = (taxable_income - 250000) * 0.05
-    elif taxable_income <= 1000000:
-        tax = (250000 * 0.05) + (taxable_income - 500000) * 0.20
-    else:
-        tax = (250000 * 0.05) + (500000 * 0.20) + (taxable_income - 1000000) * 0.30
-
-    if taxable_income <= 500000:
-        tax = 0.0
-    else:
-        tax += tax * 0.04  # health & education cess
-
-    return tax, taxable_income
-
-def calculate_new_regime_tax(annual_income):
-    taxable_income = annual_income
-    tax = 0.0
-
-    if taxable_income <= 400000:
-        tax = 0
-    elif taxable_income <= 800000:
-        tax = (taxable_income - 400000) * 0.05
-    elif taxable_income <= 1200000:
-        tax = (400000 * 0.05) + (taxable_income - 800000) * 0.10
-    elif taxable_income <= 1600000:
-        tax = (400000 * 0.05) + (400000 * 0.10) + (taxable_income - 1200000) * 0.15
-    elif taxable_income <= 2000000:
-        tax = (400000 * 0.05) + (400000 * 0.10) + (400000 * 0.15) + (taxable_income - 1600000) * 0.20
-    elif taxable_income <= 2400000:
-        tax = (400000 * 0.05) + (400000 * 0.10) + (400000 * 0.15) + (400000 * 0.20) + (taxable_income - 2000000) * 0.25
-    else:
-        tax = (400000 * 0.05) + (400000 * 0.10) + (400000 * 0.15) + (400000 * 0.20) + (400000 * 0.25) + (taxable_income - 2400000) * 0.30
-
-    if taxable_income <= 1200000:
-        tax = 0.0
-    else:
-        tax += tax * 0.04  # cess
-
-    return tax, taxable_income
-
-def calculate_sip_end_value(monthly_sip, annual_return_rate_pct, duration_years):
-    r = annual_return_rate_pct / 100.0
-    monthly_rate = (1 + r) ** (1/12) - 1
-    months = duration_years * 12
-    if monthly_rate == 0:
-        return monthly_sip * months
-    corpus = monthly_sip * (((1 + monthly_rate) ** months - 1) / monthly_rate) * (1 + monthly_rate)
-    return corpus
+from finance_engine import next_sip_corpus, yearly_summary
 
 def get_monthly_expenses():
     print("Enter your monthly expenses (in ₹):")
@@ -88,23 +35,23 @@ def run_yearly_finance_calculation():
 
         monthly_expenses, breakdown = get_monthly_expenses()
 
-        annual_salary = monthly_salary * 12
-        annual_expenses = monthly_expenses * 12
-        pf_contribution = annual_salary * pf_percent / 100
-        annual_savings_before_tax = annual_salary - annual_expenses - pf_contribution
-
-        old_tax, old_taxable_income = calculate_old_regime_tax(annual_salary, deductions_80C, deductions_80D)
-        new_tax, new_taxable_income = calculate_new_regime_tax(annual_salary)
-
-        inhand_old_annual = annual_salary - old_tax - pf_contribution - annual_expenses
-        inhand_new_annual = annual_salary - new_tax - pf_contribution - annual_expenses
+        # SIP corpus carried forward from last year
+        total_sip_corpus = next_sip_corpus(total_sip_corpus, monthly_sip, expected_return_pct)
+        summary = yearly_summary(monthly_salary, pf_percent, deductions_80C, deductions_80D,
+                                 monthly_expenses, monthly_sip, expected_return_pct, year,
+                                 sip_corpus=total_sip_corpus)
+        annual_salary = summary["annual_salary"]
+        annual_expenses = summary["annual_expenses"]
+        pf_contribution = summary["pf_contribution"]
+        annual_savings_before_tax = summary["annual_savings_before_tax"]
+        old_tax, old_taxable_income = summary["old_tax"], summary["old_taxable_income"]
+        new_tax, new_taxable_income = summary["new_tax"], summary["new_taxable_income"]
+        inhand_old_annual = summary["inhand_old_annual"]
+        inhand_new_annual = summary["inhand_new_annual"]
 
         inhand_old_monthly = inhand_old_annual / 12
         inhand_new_monthly = inhand_new_annual / 12
 
-        # SIP corpus update
-        total_sip_corpus = calculate_sip_end_value(monthly_sip, expected_return_pct, year)
-
         print("\nAnnual Summary:")
         print(f"Gross Annual Salary: ₹{annual_salary:,.2f}")
         print(f"Annual Expenses: ₹{annual_expenses:,.2f} (Breakdown: {breakdown})")
@@ -124,14 +71,14 @@ def run_yearly_finance_calculation():
         print(f"  In-Hand Monthly: ₹{inhand_new_monthly:,.2f}")
 
         print("\nSIP Investment Summary:")
-        total_invested = monthly_sip * 12 * year
+        total_invested = summary["total_invested"]
         print(f"  Year: {year}")
         print(f"  Total Invested: ₹{total_invested:,.2f}")
         print(f"  Expected Corpus: ₹{total_sip_corpus:,.2f}")
 
-        if inhand_new_annual > inhand_old_annual:
+        if summary["recommended_regime"] == "new":
             print("\nRecommendation: New Regime gives more in-hand income this year.")
-        elif inhand_old_annual > inhand_new_annual:
+        elif summary["recommended_regime"] == "old":
             print("\nRecommendation: Old Regime gives more in-hand income this year.")
         else:
             print("\nBoth regimes give similar in-hand income this year.")
@@ -0,0 +1,161 @@
+'''Monte Carlo simulation of SIP outcomes.
+calculate_sip_end_value() gives one corpus for a fixed return. Here every month's return is
+drawn at random instead: log(1 + monthly return) is normal with the annual volatility spread
+over 12 months, and its centre is lowered by sigma^2 / 2 so that the expected monthly growth is
+exactly the monthly rate the deterministic calculator uses. The expected annual return is
+therefore the mean, not the median, and the mean corpus converges on calculate_sip_end_value();
+zero volatility reproduces it exactly. Paths are generated as a paths x months matrix per chunk, only each
+path's final corpus is kept, and chunks can be spread over worker processes. Every chunk has
+its own seed derived from the run seed, so results do not depend on the number of workers.
+
+Usage: python sip_simulation.py 10000 12 15 20 --paths 100000 --goal 10000000 --workers 4'''
+
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from finance_engine import monthly_return_rate
+from lazy_numpy import get_numpy
+
+PERCENTILES = (5, 50, 95)
+
+
+def monthly_log_params(annual_return_rate_pct, annual_volatility_pct):
+    # E[exp(N(mu, sigma^2))] = exp(mu + sigma^2 / 2), hence the correction.
+    sigma = annual_volatility_pct / 100.0 / math.sqrt(12)
+    mu = math.log1p(monthly_return_rate(annual_return_rate_pct)) - sigma ** 2 / 2
+    return mu, sigma
+
+
+def monthly_sip_amounts(monthly_sip, years, step_up_pct=0):
+    return [monthly_sip * (1 + step_up_pct / 100) ** (month // 12) for month in range(years * 12)]
+
+
+def simulate_chunk(spec):
+    # spec = (monthly_sip, annual_return_rate_pct, annual_volatility_pct,
+    #         years, step_up_pct, paths, seed) -> final corpus of each path.
+    # Each instalment is invested at the start of its month and grows with
+    # that month's return and every later one.
+    monthly_sip, rate_pct, volatility_pct, years, step_up_pct, paths, seed = spec
+    mu, sigma = monthly_log_params(rate_pct, volatility_pct)
+    sips = monthly_sip_amounts(monthly_sip, years, step_up_pct)
+    months = len(sips)
+    np = get_numpy()
+
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        growth = np.exp(mu + sigma * rng.standard_normal((paths, months)))
+        # growth from the start of month k to the end of the horizon
+        remaining_growth = np.cumprod(growth[:, ::-1], axis=1)[:, ::-1]
+        return remaining_growth @ np.asarray(sips)
+
+    rng = random.Random(seed)
+    finals = []
+    for _ in range(paths):
+        corpus = 0.0
+        for sip in sips:
+            corpus = (corpus + sip) * math.exp(rng.gauss(mu, sigma))
+        finals.append(corpus)
+    return finals
+
+
+def chunk_seeds(seed, n_chunks):
+    np = get_numpy()
+    if np is not None:
+        return [np.random.default_rng(child).integers(2 ** 63) for child in np.random.SeedSequence(seed).spawn(n_chunks)]
+    return [seed * 1000003 + i for i in range(n_chunks)]
+
+
+def percentile(sorted_values, q):
+    # Linear interpolation between closest ranks, as numpy.percentile does.
+    position = (len(sorted_values) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def simulate_sip(monthly_sip, annual_return_rate_pct, annual_volatility_pct, years, paths=10000,
+                 goal=None, seed=0, chunk_size=10000, workers=1, step_up_pct=0):
+    if paths < 1:
+        raise ValueError(f"paths must be at least 1, got {paths}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    start = time.perf_counter()
+    n_chunks = math.ceil(paths / chunk_size)
+    specs = [(monthly_sip, annual_return_rate_pct, annual_volatility_pct, years, step_up_pct,
+              min(chunk_size, paths - i * chunk_size), int(chunk_seed))
+             for i, chunk_seed in enumerate(chunk_seeds(seed, n_chunks))]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        chunks = map(simulate_chunk, specs)
+        finals = _collect(chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            finals = _collect(pool.map(simulate_chunk, specs))
+    elapsed = time.perf_counter() - start
+
+    result = {"paths": paths, "total_invested": sum(monthly_sip_amounts(monthly_sip, years, step_up_pct))}
+    np = get_numpy()
+    if np is not None:
+        for q, value in zip(PERCENTILES, np.percentile(finals, PERCENTILES)):
+            result[f"p{q}"] = float(value)
+        result["mean"] = float(finals.mean())
+        if goal is not None:
+            result["goal_probability"] = float((finals >= goal).mean())
+    else:
+        finals.sort()
+        for q in PERCENTILES:
+            result[f"p{q}"] = percentile(finals, q)
+        result["mean"] = sum(finals) / len(finals)
+        if goal is not None:
+            result["goal_probability"] = sum(1 for value in finals if value >= goal) / len(finals)
+    result["seconds"] = elapsed
+    result["paths_per_second"] = paths / elapsed if elapsed else float('inf')
+    return result
+
+
+def _collect(chunks):
+    np = get_numpy()
+    if np is not None:
+        return np.concatenate(list(chunks))
+    finals = []
+    for chunk in chunks:
+        finals.extend(chunk)
+    return finals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo distribution of a SIP corpus.")
+    parser.add_argument("monthly_sip", type=float)
+    parser.add_argument("annual_return_pct", type=float, help="expected (mean) annual return (%%)")
+    parser.add_argument("volatility_pct", type=float, help="annual volatility (%%)")
+    parser.add_argument("years", type=int)
+    parser.add_argument("--paths", type=int, default=10000)
+    parser.add_argument("--goal", type=float, default=None, help="target corpus in ₹")
+    parser.add_argument("--step-up", type=float, default=0, help="annual SIP step-up (%%)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    try:
+        result = simulate_sip(args.monthly_sip, args.annual_return_pct, args.volatility_pct, args.years,
+                              args.paths, args.goal, args.seed, args.chunk_size, args.workers, args.step_up)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Total Invested: ₹{result['total_invested']:,.2f}")
+    for q in PERCENTILES:
+        print(f"{q}th percentile corpus: ₹{result[f'p{q}']:,.2f}")
+    print(f"Mean corpus: ₹{result['mean']:,.2f}")
+    if args.goal is not None:
+        print(f"Probability of reaching ₹{args.goal:,.2f}: {result['goal_probability'] * 100:.1f}%")
+    print(f"Simulated {result['paths']:,} paths in {result['seconds']:.2f}s "
+          f"({result['paths_per_second']:,.0f} paths/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+'''Columnar storage for large student rosters.
+Marks are kept in one N x 5 block of small unsigned integers (a NumPy array when NumPy is
+installed, otherwise a flat `array` of bytes) with IDs, names and sections in parallel columns.
+Totals, percentages, per-subject statistics and section toppers are computed over whole
+columns at once instead of looping over one dict per student. from_arrays() and from_snapshot()
+build the columns in bulk, without a Python-level step per student.'''
+
+from array import array
+from collections import Counter
+import math
+
+from lazy_numpy import get_numpy
+
+SUBJECTS = ('Sub1', 'Sub2', 'Sub3', 'Sub4', 'Sub5')
+MAX_TOTAL = 500
+
+
+class ColumnarStudents:
+    def __init__(self, capacity=1024, use_numpy=None):
+        np = get_numpy()
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise ImportError("NumPy is not installed")
+        self.use_numpy = use_numpy
+        self.ids = []
+        self.names = []
+        self.section_names = []
+        self._section_code = {}
+        self._size = 0
+        if use_numpy:
+            self._marks = np.zeros((max(capacity, 1), len(SUBJECTS)), dtype=np.uint8)
+            self._sections = np.zeros(max(capacity, 1), dtype=np.uint16)
+        else:
+            self._marks = array('B')
+            self._sections = array('H')
+
+    @classmethod
+    def from_records(cls, records, use_numpy=None):
+        ids, names, sections, marks = [], [], [], []
+        for s in records:
+            ids.append(s['ID'])
+            names.append(s['Name'])
+            sections.append(s['Section'])
+            marks.extend([s[sub] for sub in SUBJECTS])
+        return cls.from_arrays(ids, names, sections, marks, use_numpy)
+
+    @classmethod
+    def from_arrays(cls, ids, names, sections, marks, use_numpy=None):
+        # Bulk constructor: `marks` is an N x 5 array or a flat sequence of
+        # N * 5 marks, the other columns have one entry per student. IDs and
+        # names may be NumPy byte strings; they are decoded when read.
+        columns = cls(capacity=0, use_numpy=use_numpy)
+        n = len(ids)
+        if columns.use_numpy:
+            np = get_numpy()
+            columns._marks = np.array(marks, dtype=np.uint8).reshape(n, len(SUBJECTS))
+            labels, columns._sections = _factorize(np.asarray(sections))
+            columns.section_names = [_text(label) for label in labels]
+        else:
+            if hasattr(marks, 'ravel'):
+                marks = marks.ravel().tolist()
+            elif len(marks) and isinstance(marks[0], (list, tuple)):
+                marks = [mark for row in marks for mark in row]
+            columns._marks = array('B', marks)
+            if hasattr(sections, 'tolist'):
+                sections = sections.tolist()
+            codes = array('H')
+            for section in sections:
+                code = columns._section_code.get(section)
+                if code is None:
+                    code = columns._section_code[section] = len(columns.section_names)
+                    columns.section_names.append(section)
+                codes.append(code)
+            columns._sections = codes
+            columns.section_names = [_text(name) for name in columns.section_names]
+        columns._size = n
+        if len(names) != n or len(columns._sections) != n or len(columns.subject_column(0)) != n:
+            raise ValueError("Columns must all have one entry per student")
+        columns._section_code = {name: code for code, name in enumerate(columns.section_names)}
+        columns.ids, columns.names = ids, names
+        return columns
+
+    @classmethod
+    def from_snapshot(cls, snapshot, use_numpy=None):
+        # Columns straight from a student_db.SnapshotReader. With NumPy the
+        # mapped file is copied column by column, with no per-student work.
+        if use_numpy is None:
+            use_numpy = get_numpy() is not None
+        if not use_numpy:
+            return cls.from_records(snapshot, use_numpy=False)
+        view = snapshot.as_numpy()
+        return cls.from_arrays(view['ID'].copy(), view['Name'].copy(), view['Section'],
+                               view['Marks'], use_numpy=True)
+
+    def __len__(self):
+        return self._size
+
+    def append(self, student_id, name, section, marks):
+        if len(marks) != len(SUBJECTS):
+            raise ValueError(f"Expected {len(SUBJECTS)} marks, got {len(marks)}")
+        code = self._section_code.get(section)
+        if code is None:
+            code = self._section_code[section] = len(self.section_names)
+            self.section_names.append(section)
+
+        if not isinstance(self.ids, list):
+            self.ids = [_text(v) for v in self.ids.tolist()]
+            self.names = [_text(v) for v in self.names.tolist()]
+        if self.use_numpy:
+            if self._size == len(self._marks):
+                self._grow()
+            self._marks[self._size] = marks
+            self._sections[self._size] = code
+        else:
+            self._marks.extend(marks)
+            self._sections.append(code)
+        self.ids.append(student_id)
+        self.names.append(name)
+        self._size += 1
+
+    def _grow(self):
+        np = get_numpy()
+        capacity = max(len(self._marks) * 2, 1)
+        marks = np.zeros((capacity, len(SUBJECTS)), dtype=np.uint8)
+        marks[:self._size] = self._marks[:self._size]
+        sections = np.zeros(capacity, dtype=np.uint16)
+        sections[:self._size] = self._sections[:self._size]
+        self._marks, self._sections = marks, sections
+
+    def record(self, i):
+        marks = self.marks_of(i)
+        s = {"Name": _text(self.names[i]), "ID": _text(self.ids[i]),
+             "Section": self.section_names[self._sections[i]]}
+        s.update(zip(SUBJECTS, marks))
+        s['Total'] = sum(marks)
+        s['Percentage'] = (s['Total'] / MAX_TOTAL) * 100
+        return s
+
+    def marks_of(self, i):
+        if self.use_numpy:
+            return [int(m) for m in self._marks[i]]
+        width = len(SUBJECTS)
+        return list(self._marks[i * width:(i + 1) * width])
+
+    def subject_column(self, j):
+        if self.use_numpy:
+            return self._marks[:self._size, j]
+        return self._marks[j::len(SUBJECTS)]
+
+    def totals(self):
+        if self.use_numpy:
+            return self._marks[:self._size].sum(axis=1, dtype=get_numpy().int32)
+        columns = [self.subject_column(j) for j in range(len(SUBJECTS))]
+        return array('H', map(sum, zip(*columns)))
+
+    def percentages(self):
+        totals = self.totals()
+        if self.use_numpy:
+            return totals * (100.0 / MAX_TOTAL)
+        return array('d', (t * 100.0 / MAX_TOTAL for t in totals))
+
+    def subject_stats(self):
+        stats = {}
+        for j, sub in enumerate(SUBJECTS):
+            column = self.subject_column(j)
+            if self._size == 0:
+                stats[sub] = {"Mean": 0.0, "Median": 0.0, "StdDev": 0.0}
+            elif self.use_numpy:
+                stats[sub] = {"Mean": float(column.mean()),
+                              "Median": float(get_numpy().median(column)),
+                              "StdDev": float(column.std())}
+            else:
+                stats[sub] = _histogram_stats(Counter(column), self._size)
+        return stats
+
+    def section_toppers(self):
+        # {section: (ID, Name, Total)}; ties go to the student added first.
+        if self._size == 0:
+            return {}
+        totals = self.totals()
+        if self.use_numpy:
+            np = get_numpy()
+            sections = self._sections[:self._size]
+            order = np.lexsort((-totals, sections))
+            codes, first = np.unique(sections[order], return_index=True)
+            best = order[first]
+            return {self.section_names[c]: (_text(self.ids[i]), _text(self.names[i]), int(totals[i]))
+                    for c, i in zip(codes.tolist(), best.tolist())}
+
+        best = {}
+        for i, (code, total) in enumerate(zip(self._sections, totals)):
+            current = best.get(code)
+            if current is None or total > totals[current]:
+                best[code] = i
+        return {self.section_names[c]: (_text(self.ids[i]), _text(self.names[i]), totals[i])
+                for c, i in sorted(best.items())}
+
+
+def _factorize(values, max_labels=64):
+    # (distinct values in order of first appearance, uint16 code per value),
+    # numbered the same way append() numbers sections. There are only a few
+    # sections, so one vectorised comparison per section is much cheaper than
+    # sorting the whole column; np.unique takes over if there turn out to be many.
+    np = get_numpy()
+    keys = values
+    if values.dtype.kind == 'S' and values.dtype.itemsize in (1, 2, 4, 8):
+        # Short byte strings compare far faster as integers.
+        keys = np.ascontiguousarray(values).view(f'u{values.dtype.itemsize}')
+    codes = np.zeros(len(values), dtype=np.uint16)
+    unassigned = np.ones(len(values), dtype=bool)
+    labels = []
+    while len(labels) < max_labels and len(values):
+        i = int(unassigned.argmax())
+        if not unassigned[i]:
+            return labels, codes
+        match = keys == keys[i]
+        codes[match] = len(labels)
+        unassigned &= ~match
+        labels.append(values[i].item())
+    if not unassigned.any():
+        return labels, codes
+
+    distinct, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    renumber = np.empty(len(order), dtype=np.uint16)
+    renumber[order] = np.arange(len(order), dtype=np.uint16)
+    return distinct[order].tolist(), renumber[inverse.reshape(-1)]
+
+
+def _text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def _histogram_stats(counts, n):
+    # Marks are small integers, so mean, population stddev and median all
+    # come from one pass over the value histogram.
+    mean = sum(v * c for v, c in counts.items()) / n
+    variance = sum(c * (v - mean) ** 2 for v, c in counts.items()) / n
+
+    lower, upper = (n - 1) // 2, n // 2
+    seen = 0
+    low_value = high_value = None
+    for v in sorted(counts):
+        seen += counts[v]
+        if low_value is None and seen > lower:
+            low_value = v
+        if seen > upper:
+            high_value = v
+            break
+    return {"Mean": mean, "Median": (low_value + high_value) / 2, "StdDev": math.sqrt(variance)}
@@ -0,0 +1,338 @@
+'''On-disk storage for the student roster.
+Every add, update and delete is appended to a change log (one JSON line per change), so a
+write never rewrites the roster. Once the log grows past a threshold it is compacted into a
+fixed-width binary snapshot, which is read back through `mmap` so records can be decoded on
+demand instead of parsing the whole file at startup. A line torn by an interrupted write is cut
+off when the log is reopened, so later changes always start on a line of their own.'''
+
+import json
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+
+from lazy_numpy import get_numpy
+
+SUBJECTS = ('Sub1', 'Sub2', 'Sub3', 'Sub4', 'Sub5')
+
+SNAPSHOT_MAGIC = b'STDB'
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct('<4sHI')
+RECORD = struct.Struct('<16s48s8s5B')
+ID_WIDTH, NAME_WIDTH, SECTION_WIDTH = 16, 48, 8
+
+
+def _encode(value, width, field):
+    data = str(value).encode('utf-8')
+    if len(data) > width:
+        raise ValueError(f"{field} {value!r} is longer than {width} bytes")
+    return data
+
+
+def _decode(data):
+    return data.rstrip(b'\0').decode('utf-8')
+
+
+def pack_record(s):
+    return RECORD.pack(_encode(s['ID'], ID_WIDTH, 'ID'),
+                       _encode(s['Name'], NAME_WIDTH, 'Name'),
+                       _encode(s['Section'], SECTION_WIDTH, 'Section'),
+                       *(s[sub] for sub in SUBJECTS))
+
+
+def unpack_record(buffer, offset=0):
+    student_id, name, section, *marks = RECORD.unpack_from(buffer, offset)
+    s = {"Name": _decode(name), "ID": _decode(student_id), "Section": _decode(section)}
+    s.update(zip(SUBJECTS, marks))
+    return s
+
+
+def write_snapshot(path, records):
+    return _write_packed(path, map(pack_record, records))
+
+
+def _write_packed(path, packed):
+    # Streams already packed records into a new snapshot, then swaps it in.
+    tmp_path = path + '.tmp'
+    count = 0
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0))
+        for record in packed:
+            f.write(record)
+            count += 1
+        f.seek(0)
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, count))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+class SnapshotReader:
+    # Random access to a snapshot file; records are only decoded when read.
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a student snapshot")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:
+            # Arrays from as_numpy() still point into the map; it is
+            # released once the last of them is gone.
+            pass
+        self._file.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return unpack_record(self._map, HEADER.size + i * RECORD.size)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield unpack_record(self._map, HEADER.size + i * RECORD.size)
+
+    def keys(self):
+        # (ID, Name, Section, Total) of every record, in file order, without
+        # building a dict per student.
+        for offset in range(HEADER.size, HEADER.size + self._count * RECORD.size, RECORD.size):
+            student_id, name, section, *marks = RECORD.unpack_from(self._map, offset)
+            yield _decode(student_id), _decode(name), _decode(section), sum(marks)
+
+    def packed(self):
+        # (ID, packed record) of every record, in file order, so records can
+        # be copied into a new snapshot without being decoded and re-encoded.
+        for offset in range(HEADER.size, HEADER.size + self._count * RECORD.size, RECORD.size):
+            record = self._map[offset:offset + RECORD.size]
+            yield _decode(record[:ID_WIDTH]), record
+
+    def as_numpy(self):
+        # Zero-copy structured view of the whole snapshot. It stays valid
+        # after close(), which leaves the map to be released with the view.
+        np = get_numpy()
+        if np is None:
+            raise ImportError("NumPy is not installed")
+        dtype = np.dtype([('ID', f'S{ID_WIDTH}'), ('Name', f'S{NAME_WIDTH}'), ('Section', f'S{SECTION_WIDTH}'),
+                          ('Marks', 'u1', (len(SUBJECTS),))])
+        return np.frombuffer(self._map, dtype=dtype, count=self._count, offset=HEADER.size)
+
+
+class StudentDB:
+    # Journal for StudentStore: put()/delete() append to the log, and the log
+    # is folded into the snapshot once it holds `compact_every` changes.
+    def __init__(self, directory, compact_every=10000, fsync=False):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, 'students.snap')
+        self.log_path = os.path.join(directory, 'students.log')
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._batch_depth = 0
+        self._snapshot = None
+        os.makedirs(directory, exist_ok=True)
+        self._drop_torn_line()
+        self._log = open(self.log_path, 'a', encoding='utf-8')
+        self._log_size = os.path.getsize(self.log_path)
+        self.log_entries = sum(1 for _ in self._read_log())
+
+    def close(self):
+        self._log.close()
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def is_empty(self):
+        return not os.path.exists(self.snapshot_path) and self.log_entries == 0
+
+    def load(self):
+        records = {}
+        if os.path.exists(self.snapshot_path):
+            with SnapshotReader(self.snapshot_path) as snapshot:
+                for s in snapshot:
+                    records[s['ID']] = s
+        for entry in self._read_log():
+            if entry['op'] == 'put':
+                records[entry['record']['ID']] = entry['record']
+            else:
+                records.pop(entry['ID'], None)
+        return list(records.values())
+
+    def snapshot(self):
+        # The current snapshot for random access, or None before the first
+        # compaction. A reader handed out here is not closed by compact(), so
+        # records still being decoded from it stay valid until close().
+        if self._snapshot is None and os.path.exists(self.snapshot_path):
+            self._snapshot = SnapshotReader(self.snapshot_path)
+        return self._snapshot
+
+    def changes(self):
+        # Log entries written since the snapshot, oldest first.
+        return self._read_log()
+
+    def put(self, record):
+        s = {"Name": record['Name'], "ID": record['ID'], "Section": record['Section']}
+        s.update((sub, record[sub]) for sub in SUBJECTS)
+        try:
+            pack_record(s)  # reject records the snapshot could not hold
+        except struct.error as e:
+            raise ValueError(f"Cannot store student {s['ID']!r}: {e}") from None
+        self._append({"op": "put", "record": s})
+
+    def delete(self, student_id):
+        self._append({"op": "del", "ID": student_id})
+
+    @contextmanager
+    def batch(self):
+        # Inside a batch, log writes are buffered and compaction is deferred
+        # until the outermost batch ends. If the batch cannot be flushed, none
+        # of its writes are kept and the error is raised from here.
+        if self._batch_depth == 0:
+            mark = self._mark()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._commit(mark)
+
+    def compact(self, records=None):
+        # Without `records`, the log is merged into the snapshot as a stream:
+        # only the latest change per student is held in memory, and students
+        # the log never touched are copied across as they are.
+        if records is not None:
+            write_snapshot(self.snapshot_path, records)
+        elif os.path.exists(self.snapshot_path):
+            with SnapshotReader(self.snapshot_path) as snapshot:
+                _write_packed(self.snapshot_path, self._merged(snapshot))
+        else:
+            _write_packed(self.snapshot_path, self._merged(None))
+        self._snapshot = None
+        self._log.close()
+        self._log = open(self.log_path, 'w', encoding='utf-8')
+        self._log_size = 0
+        self.log_entries = 0
+
+    def _merged(self, snapshot):
+        # Packed records of `snapshot` with the log applied, in the order
+        # load() returns them.
+        latest = self._latest_changes()
+        if snapshot is not None:
+            for student_id, record in snapshot.packed():
+                change = latest.get(student_id, False)
+                if change is False:
+                    yield record
+                elif change is not None and not change[1]:
+                    del latest[student_id]
+                    yield pack_record(change[0])
+        for change in latest.values():
+            if change is not None:
+                yield pack_record(change[0])
+
+    def _latest_changes(self):
+        # The log folded to one entry per student: None if the student was
+        # deleted, else (record, readded), where `readded` means the student
+        # was deleted and put back, which moves it to the end like in load().
+        latest = {}
+        for entry in self._read_log():
+            if entry['op'] == 'del':
+                latest.pop(entry['ID'], None)
+                latest[entry['ID']] = None
+                continue
+            record = entry['record']
+            student_id = record['ID']
+            if student_id not in latest:
+                latest[student_id] = (record, False)
+            elif latest[student_id] is None:
+                del latest[student_id]
+                latest[student_id] = (record, True)
+            else:
+                latest[student_id] = (record, latest[student_id][1])
+        return latest
+
+    def _append(self, entry):
+        mark = self._mark()
+        line = json.dumps(entry) + '\n'  # ASCII only, so one byte per character
+        self._log.write(line)
+        self._log_size += len(line)
+        self.log_entries += 1
+        if not self._batch_depth:
+            self._commit(mark)
+
+    def _mark(self):
+        return self._log_size, self.log_entries
+
+    def _commit(self, mark):
+        # Flushes everything written since `mark`. On failure those writes are
+        # cut from the file and dropped from the buffer, so a later flush
+        # cannot persist changes that were reported as failed.
+        try:
+            self._sync()
+        except BaseException:
+            self._rollback(mark)
+            raise
+        if self.log_entries >= self.compact_every:
+            try:
+                self.compact()
+            except OSError:
+                pass  # the log still holds every change; compaction is retried on the next write
+
+    def _rollback(self, mark):
+        size, self.log_entries = mark
+        try:
+            self._log.close()
+        except OSError:
+            pass  # closing failed to flush: the buffered writes are discarded with the file object
+        with open(self.log_path, 'rb+') as f:
+            f.truncate(size)
+        self._log = open(self.log_path, 'a', encoding='utf-8')
+        self._log_size = size
+
+    def _sync(self):
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+
+    def _drop_torn_line(self):
+        # Every entry ends with a newline, so anything after the last one was
+        # cut short by an interrupted write. Truncating it keeps the next
+        # append from being glued onto the fragment.
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                step = min(4096, position)
+                position -= step
+                f.seek(position)
+                newline = f.read(step).rfind(b'\n')
+                if newline >= 0:
+                    position += newline + 1
+                    break
+            if position != end:
+                f.truncate(position)
+
+    def _read_log(self):
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a damaged line; the entries after it are still good
+                if isinstance(entry, dict) and entry.get('op') in ('put', 'del'):
+                    yield entry
@@ -0,0 +1,209 @@
+'''Secondary indexes kept up to date by StudentStore.
+Totals can only take MAX_TOTAL + 1 values, so TotalIndex keeps one insertion-ordered bucket of
+rows per total, with the bucket sizes in a ScoreCounts Fenwick tree: adding or removing a
+student is a dict operation plus O(log MAX_TOTAL), and the tree finds the bucket a page starts
+in, as well as answering "how many students scored below / above this total" for rank and
+percentile queries. OrderedIndex keeps (key, row) pairs sorted in a list of small blocks, so an
+insert or delete shifts one block instead of the whole roster.'''
+
+from bisect import bisect_left, insort
+from itertools import islice
+
+
+class OrderedIndex:
+    # Sorted (key, row) pairs in blocks of at most 2 * BLOCK_SIZE; the last
+    # pair of every block is kept in `_maxes` to find a block by bisection.
+    BLOCK_SIZE = 512
+
+    def __init__(self):
+        self._blocks = []
+        self._maxes = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def add(self, key, row):
+        item = (key, row)
+        self._len += 1
+        if not self._blocks:
+            self._blocks.append([item])
+            self._maxes.append(item)
+            return
+        b = bisect_left(self._maxes, item)
+        if b == len(self._maxes):
+            b -= 1
+            self._blocks[b].append(item)
+            self._maxes[b] = item
+        else:
+            insort(self._blocks[b], item)
+        block = self._blocks[b]
+        if len(block) > 2 * self.BLOCK_SIZE:
+            upper = block[self.BLOCK_SIZE:]
+            del block[self.BLOCK_SIZE:]
+            self._blocks.insert(b + 1, upper)
+            self._maxes[b] = block[-1]
+            self._maxes.insert(b + 1, upper[-1])
+
+    def extend(self, items):
+        # Adds many (key, row) pairs; an empty index is built from one sort
+        # instead of one insertion per pair.
+        if self._len:
+            for key, row in items:
+                self.add(key, row)
+            return
+        items = sorted(items)
+        self._blocks = [items[i:i + self.BLOCK_SIZE] for i in range(0, len(items), self.BLOCK_SIZE)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(items)
+
+    def remove(self, key, row):
+        item = (key, row)
+        b = bisect_left(self._maxes, item)
+        if b == len(self._maxes):
+            return
+        block = self._blocks[b]
+        i = bisect_left(block, item)
+        if i == len(block) or block[i] != item:
+            return
+        del block[i]
+        self._len -= 1
+        if not block:
+            del self._blocks[b]
+            del self._maxes[b]
+        elif i == len(block):
+            self._maxes[b] = block[-1]
+
+    def rows(self, offset=0, limit=None, reverse=False):
+        n = self._len
+        stop = n if limit is None else min(n, offset + limit)
+        if offset >= stop:
+            return []
+        start, end = (n - stop, n - offset) if reverse else (offset, stop)
+        rows = []
+        seen = 0
+        for block in self._blocks:
+            if seen + len(block) > start:
+                rows.extend(row for _, row in block[max(start - seen, 0):end - seen])
+            seen += len(block)
+            if seen >= end:
+                break
+        return rows[::-1] if reverse else rows
+
+    def position(self, key, row):
+        # 0-based position of an entry, or None if it is not indexed.
+        item = (key, row)
+        b = bisect_left(self._maxes, item)
+        if b == len(self._maxes):
+            return None
+        block = self._blocks[b]
+        i = bisect_left(block, item)
+        if i == len(block) or block[i] != item:
+            return None
+        return sum(len(block) for block in self._blocks[:b]) + i
+
+
+class ScoreCounts:
+    def __init__(self, max_score):
+        self.max_score = max_score
+        self.count = 0
+        self._tree = [0] * (max_score + 2)
+
+    def add(self, score, delta=1):
+        self.count += delta
+        i = score + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def add_counts(self, counts):
+        # Adds counts[score] students at every score in one O(max_score) pass.
+        tree = [0] + list(counts)
+        tree += [0] * (len(self._tree) - len(tree))
+        for i in range(1, len(tree)):
+            j = i + (i & -i)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self._tree = [a + b for a, b in zip(self._tree, tree)]
+        self.count += sum(counts)
+
+    def at_most(self, score):
+        # Number of students with a total <= score.
+        score = min(score, self.max_score)
+        n = 0
+        i = score + 1
+        while i > 0:
+            n += self._tree[i]
+            i -= i & -i
+        return n
+
+    def below(self, score):
+        return self.at_most(score - 1) if score > 0 else 0
+
+    def above(self, score):
+        return self.count - self.at_most(score)
+
+    def find(self, k):
+        # The k-th lowest score (0-based), found by descending the tree.
+        i = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            j = i + step
+            if j < len(self._tree) and self._tree[j] <= k:
+                i = j
+                k -= self._tree[j]
+            step >>= 1
+        return i
+
+
+class TotalIndex:
+    # Rows by total, highest first. Students with the same total are listed
+    # in the order they reached it.
+    def __init__(self, max_total):
+        self.counts = ScoreCounts(max_total)
+        self._buckets = [{} for _ in range(max_total + 1)]
+
+    def __len__(self):
+        return self.counts.count
+
+    def add(self, total, row):
+        self._buckets[total][row] = None
+        self.counts.add(total)
+
+    def extend(self, items):
+        # Adds many (total, row) pairs, updating the tree once.
+        counts = [0] * len(self._buckets)
+        for total, row in items:
+            self._buckets[total][row] = None
+            counts[total] += 1
+        self.counts.add_counts(counts)
+
+    def remove(self, total, row):
+        bucket = self._buckets[total]
+        if row in bucket:
+            del bucket[row]
+            self.counts.add(total, -1)
+
+    def rows(self, offset=0, limit=None, reverse=False):
+        n = self.counts.count
+        want = n - offset if limit is None else min(n - offset, limit)
+        rows = []
+        if want <= 0:
+            return rows
+        if reverse:
+            total = self.counts.find(offset)
+            skip = offset - self.counts.below(total)
+            totals = range(total, self.counts.max_score + 1)
+        else:
+            total = self.counts.find(n - 1 - offset)
+            skip = offset - self.counts.above(total)
+            totals = range(total, -1, -1)
+        for total in totals:
+            bucket = self._buckets[total]
+            if not bucket:
+                continue
+            rows.extend(islice(reversed(bucket) if reverse else bucket, skip, skip + want - len(rows)))
+            skip = 0
+            if len(rows) == want:
+                break
+        return rows
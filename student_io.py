@@ -0,0 +1,150 @@
+'''Bulk import and export of student records as CSV or JSONL.
+Files are streamed in fixed-size batches, so memory use does not depend on the file size.
+Each batch is validated as a whole (required fields, integer marks between 0 and 100, IDs
+that are unique within the file and against the store); bad rows are reported and skipped
+instead of stopping the import.'''
+
+import csv
+import json
+from contextlib import nullcontext
+from itertools import islice
+
+SUBJECTS = ('Sub1', 'Sub2', 'Sub3', 'Sub4', 'Sub5')
+FIELDS = ('Name', 'ID', 'Section') + SUBJECTS
+EXPORT_FIELDS = FIELDS + ('Total', 'Percentage')
+MAX_MARK = 100
+
+
+def detect_format(path, fmt=None):
+    if fmt is None:
+        fmt = 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported format: {fmt}")
+    return fmt
+
+
+def read_rows(f, fmt):
+    # Yields (line_number, row) pairs; a row is a dict, or None if the line
+    # could not be parsed at all.
+    if fmt == 'csv':
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else None
+
+
+def parse_mark(value):
+    # An integer mark from a CSV string or a JSON number, or None. Booleans
+    # and fractional numbers are rejected rather than truncated.
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def validate_row(row):
+    if row is None:
+        raise ValueError("unreadable row")
+    s = {}
+    for field in ('Name', 'ID', 'Section'):
+        value = row.get(field)
+        value = '' if value is None else str(value).strip()
+        if not value:
+            raise ValueError(f"missing {field}")
+        s[field] = value
+    for sub in SUBJECTS:
+        value = row.get(sub)
+        mark = parse_mark(value)
+        if mark is None:
+            raise ValueError(f"{sub} is not an integer: {value!r}")
+        if not 0 <= mark <= MAX_MARK:
+            raise ValueError(f"{sub} out of range 0-{MAX_MARK}: {mark}")
+        s[sub] = mark
+    return s
+
+
+def validate_batch(batch, store):
+    # Returns (valid records, [(line_number, reason), ...]).
+    valid, errors = [], []
+    batch_ids = set()
+    for line_no, row in batch:
+        try:
+            s = validate_row(row)
+        except ValueError as e:
+            errors.append((line_no, str(e)))
+            continue
+        student_id = s['ID']
+        if student_id in batch_ids or student_id in store:
+            errors.append((line_no, f"duplicate ID {student_id}"))
+            continue
+        batch_ids.add(student_id)
+        valid.append((line_no, s))
+    return valid, errors
+
+
+def import_students(path, store, fmt=None, batch_size=10000, max_errors=1000):
+    # Adds every valid row to `store`. Returns a report with the number of
+    # imported and rejected rows and the first `max_errors` rejections.
+    fmt = detect_format(path, fmt)
+    report = {"imported": 0, "rejected": 0, "errors": []}
+    journal = store.journal
+    batch_writes = journal.batch() if hasattr(journal, 'batch') else nullcontext()
+
+    with open(path, newline='', encoding='utf-8') as f, batch_writes:
+        rows = read_rows(f, fmt)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            valid, errors = validate_batch(batch, store)
+            for line_no, s in valid:
+                try:
+                    store.add(s)
+                except ValueError as e:
+                    errors.append((line_no, str(e)))
+                else:
+                    report["imported"] += 1
+            report["rejected"] += len(errors)
+            room = max_errors - len(report["errors"])
+            if room > 0:
+                report["errors"].extend(sorted(errors)[:room])
+    return report
+
+
+def export_students(records, path, fmt=None, chunk_size=10000):
+    # Streams `records` (any iterable of student dicts) to `path` and returns
+    # the number of rows written.
+    fmt = detect_format(path, fmt)
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        records = iter(records)
+        if fmt == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_FIELDS)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            rows = [[s.get(field) for field in EXPORT_FIELDS] for s in chunk]
+            if fmt == 'csv':
+                writer.writerows(rows)
+            else:
+                f.write(''.join(json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in rows))
+            count += len(chunk)
+    return count
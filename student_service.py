@@ -0,0 +1,338 @@
+'''Local asyncio service for the student management operations.
+Clients connect over TCP and send one JSON request per line, e.g.
+    {"op": "search_student", "student_id": "S001"}
+and get one JSON response per line: {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+
+Reads (view/search/stats) share a reader-writer lock, so any number of them run together,
+while writes are queued to a single writer task. The writer applies everything waiting in the
+queue under one write-lock hold and one journal batch, so storage is flushed once per batch
+instead of once per change. Every operation is counted and timed (including time spent waiting
+for the lock) into a latency histogram; send {"op": "metrics"} to read them.
+
+Operations: add_student, view_students, search_student, update_student, delete_student,
+stats, metrics.
+
+Usage: python student_service.py [--host 127.0.0.1] [--port 8765]'''
+
+import argparse
+import asyncio
+import json
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager, nullcontext
+
+from student_io import validate_row
+from student_store import FIELDS, get_store
+
+
+class RWLock:
+    # Many readers or one writer. Waiting writers block new readers, so a
+    # steady stream of reads cannot starve updates.
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @asynccontextmanager
+    async def read(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writer and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self):
+        async with self._condition:
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(lambda: not self._writer and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class LatencyHistogram:
+    # Fixed buckets from 1us to 10s (upper bounds, in microseconds).
+    BOUNDS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000,
+                 100000, 200000, 500000, 1000000, 2000000, 5000000, 10000000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+
+    def observe(self, seconds):
+        us = seconds * 1e6
+        self.counts[bisect_left(self.BOUNDS_US, us)] += 1
+        self.count += 1
+        self.total_us += us
+
+    def percentile(self, q):
+        # Upper bound of the bucket holding the q-th percentile.
+        if not self.count:
+            return None
+        target = self.count * q / 100
+        seen = 0
+        for bound, n in zip(self.BOUNDS_US + (float('inf'),), self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float('inf')
+
+    def snapshot(self):
+        buckets = {f"<={bound}us": n for bound, n in zip(self.BOUNDS_US, self.counts) if n}
+        if self.counts[-1]:
+            buckets[f">{self.BOUNDS_US[-1]}us"] = self.counts[-1]
+        return {"count": self.count,
+                "mean_us": self.total_us / self.count if self.count else None,
+                "p50_us": self.percentile(50), "p99_us": self.percentile(99),
+                "buckets": buckets}
+
+
+class Metrics:
+    def __init__(self):
+        self.histograms = {}
+        self.errors = {}
+
+    @asynccontextmanager
+    async def timed(self, op):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors[op] = self.errors.get(op, 0) + 1
+            raise
+        finally:
+            histogram = self.histograms.get(op)
+            if histogram is None:
+                histogram = self.histograms[op] = LatencyHistogram()
+            histogram.observe(time.perf_counter() - start)
+
+    def snapshot(self):
+        return {op: dict(histogram.snapshot(), errors=self.errors.get(op, 0))
+                for op, histogram in sorted(self.histograms.items())}
+
+
+class StudentService:
+    def __init__(self, store=None, max_batch=500):
+        self.store = store if store is not None else get_store()
+        self.max_batch = max_batch
+        self.metrics = Metrics()
+        self._lock = RWLock()
+        self._writes = None
+        self._writer_task = None
+
+    async def __aenter__(self):
+        self._writes = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_loop())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+
+    # Reads
+
+    async def search_student(self, student_id):
+        async with self.metrics.timed('search_student'), self._lock.read():
+            s = self.store.get(student_id)
+            if s is None:
+                return None
+            result = dict(s)
+            result['Rank'], result['OutOf'] = self.store.rank(student_id)
+            result['SectionRank'], result['SectionSize'] = self.store.rank(student_id, within_section=True)
+            return result
+
+    async def view_students(self, sort_by=None, section=None, offset=0, limit=100):
+        async with self.metrics.timed('view_students'), self._lock.read():
+            # Large pages are built off the event loop; the read lock keeps
+            # writers out while the worker thread reads the store.
+            page = await asyncio.to_thread(self.store.ordered, sort_by, section, offset, limit)
+            return [dict(s) for s in page]
+
+    async def stats(self, section=None):
+        async with self.metrics.timed('stats'), self._lock.read():
+            return self.store.school_stats() if section is None else self.store.section_stats(section)
+
+    async def get_metrics(self):
+        return self.metrics.snapshot()
+
+    # Writes
+
+    async def add_student(self, record):
+        async with self.metrics.timed('add_student'):
+            s = validate_row(record)
+            return dict(await self._write(self._add, s))
+
+    async def update_student(self, student_id, fields):
+        async with self.metrics.timed('update_student'):
+            if not isinstance(fields, dict):
+                raise TypeError("fields must be an object")
+            unknown = set(fields) - set(FIELDS)
+            if unknown:
+                raise ValueError(f"Cannot update {', '.join(sorted(unknown))}")
+            current = self.store.get(student_id)
+            if current is None:
+                raise KeyError(student_id)
+            # Validate the student as it would look after the update, with
+            # the same rules as add_student, and store the cleaned values.
+            s = validate_row(dict(current, **fields))
+            fields = {field: s[field] for field in fields}
+            return dict(await self._write(self._update, student_id, fields))
+
+    async def delete_student(self, student_id):
+        async with self.metrics.timed('delete_student'):
+            return await self._write(self._delete, student_id) is not None
+
+    # Each write op applies one change and returns (result, undo), where
+    # undo() takes the change back out of the store if its batch is not
+    # flushed.
+
+    def _add(self, s):
+        record = self.store.add(s)
+        return record, lambda: self.store.delete(record['ID'])
+
+    def _update(self, student_id, fields):
+        current = self.store.get(student_id)
+        if current is None:
+            raise KeyError(student_id)
+        before = {field: current[field] for field in FIELDS}
+        record = self.store.update(student_id, **fields)
+        return record, lambda: self.store.update(record['ID'], **before)
+
+    def _delete(self, student_id):
+        record = self.store.delete(student_id)
+        if record is None:
+            return None, None
+        return record, lambda: self.store.add({field: record[field] for field in FIELDS})
+
+    def _revert(self, undo):
+        # The journal has already dropped the batch, so the undo is not logged.
+        journal, self.store.journal = self.store.journal, None
+        try:
+            for revert in reversed(undo):
+                revert()
+        finally:
+            self.store.journal = journal
+
+    async def _write(self, op, *args):
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((op, args, future))
+        return await future
+
+    async def _write_loop(self):
+        while True:
+            batch = [await self._writes.get()]
+            while len(batch) < self.max_batch and not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            journal = self.store.journal
+            outcomes = []
+            undo = []
+            try:
+                async with self._lock.write():
+                    try:
+                        with journal.batch() if hasattr(journal, 'batch') else nullcontext():
+                            for op, args, future in batch:
+                                if future.cancelled():
+                                    continue
+                                try:
+                                    result, revert = op(*args)
+                                except Exception as e:
+                                    outcomes.append((future, None, e))
+                                    continue
+                                outcomes.append((future, result, None))
+                                if revert is not None:
+                                    undo.append(revert)
+                    except Exception:
+                        # The batch never reached the disk; take it back out
+                        # of the store too, before readers can see it.
+                        self._revert(undo)
+                        raise
+            except Exception as e:
+                # Flushing the batch failed, so none of it can be acknowledged.
+                outcomes = [(future, None, e) for future, _, _ in outcomes]
+            # Results are only released once the batch is on disk.
+            for future, result, error in outcomes:
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+
+    # Protocol
+
+    async def handle(self, request):
+        handlers = {
+            'add_student': self.add_student,
+            'view_students': self.view_students,
+            'search_student': self.search_student,
+            'update_student': self.update_student,
+            'delete_student': self.delete_student,
+            'stats': self.stats,
+            'metrics': self.get_metrics,
+        }
+        request = dict(request)
+        op = request.pop('op', None)
+        if op not in handlers:
+            raise ValueError(f"Unknown op: {op}")
+        return await handlers[op](**request)
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                    response = {"ok": True, "result": await self.handle(request)}
+                except Exception as e:
+                    # Bad requests and storage failures alike become an error
+                    # response; the connection stays open.
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8765):
+    async with StudentService() as service:
+        server = await asyncio.start_server(service.handle_client, host, port)
+        print(f"Student service listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the student management operations over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
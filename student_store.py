@@ -0,0 +1,356 @@
+'''Student records engine: an indexed in-memory store with optional on-disk persistence.
+Importing this module does no I/O; get_store() opens (and, the first time, seeds) the
+database on first use.'''
+
+import os
+from itertools import islice
+
+from student_db import StudentDB
+from student_index import OrderedIndex, TotalIndex
+
+SUBJECTS = ('Sub1', 'Sub2', 'Sub3', 'Sub4', 'Sub5')
+FIELDS = ('Name', 'ID', 'Section') + SUBJECTS
+MAX_MARK = 100
+MAX_TOTAL = 500
+SORT_KEYS = ('Total', 'Percentage', 'Name')
+
+
+def validate_record(s):
+    # Everything the indexes and the snapshot rely on, checked before a
+    # change is journaled or indexed: string keys (they are sorted against
+    # each other) and integer marks in range.
+    for field in ('Name', 'ID', 'Section'):
+        value = s.get(field)
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"{field} must be a non-empty string, got {value!r}")
+    for sub in SUBJECTS:
+        mark = s.get(sub)
+        if isinstance(mark, bool) or not isinstance(mark, int):
+            raise ValueError(f"{sub} must be an integer, got {mark!r}")
+        if not 0 <= mark <= MAX_MARK:
+            raise ValueError(f"{sub} must be between 0 and {MAX_MARK}, got {mark}")
+    return s
+
+
+def calculate_marks(s):
+    s['Total'] = s['Sub1'] + s['Sub2'] + s['Sub3'] + s['Sub4'] + s['Sub5']
+    s['Percentage'] = (s['Total'] / MAX_TOTAL) * 100
+    return s
+
+
+class StudentStore:
+    # Students are kept in insertion order and indexed by ID, Section and Name,
+    # so lookups, updates and deletes never have to scan the whole roster.
+    # Total/Percentage are only recomputed when a student's marks change, and
+    # running [sum, count] aggregates of Total are kept per section and for
+    # the whole school. If a journal is given, every change is also passed to
+    # journal.put(record) / journal.delete(student_id) for persistence.
+    # Students restored from a snapshot are only indexed by their keys; each
+    # one's full record is decoded the first time it is read.
+    # Ordered indexes by Total and by Name (overall and per section) serve
+    # sorted, paginated views without re-sorting. The Total index is a set of
+    # per-total buckets counted by a Fenwick tree, which also answers rank and
+    # percentile queries in O(log MAX_TOTAL).
+    def __init__(self, records=(), journal=None):
+        self._rows = {}
+        self._row_of = {}
+        self._next_row = 0
+        self._by_section = {}
+        self._by_name = {}
+        self._section_totals = {}
+        self._school_total = [0, 0]
+        self._orders = self._new_orders()
+        self._section_orders = {}
+        self._snapshot = None
+        self.journal = None
+        for record in records:
+            self.add(record)
+        self.journal = journal
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        # Walks a copy of the rows, so the store may change meanwhile; snapshot
+        # students are decoded for the caller without being kept in memory.
+        for row in list(self._rows):
+            record = self._rows.get(row)
+            if type(record) is int:
+                record = calculate_marks(self._snapshot[record])
+            if record is not None:
+                yield record
+
+    def __contains__(self, student_id):
+        return student_id in self._row_of
+
+    def get(self, student_id):
+        row = self._row_of.get(student_id)
+        if row is None:
+            return None
+        return self._record(row)
+
+    def by_section(self, section):
+        return [self._record(row) for row in self._by_section.get(section, {}).values()]
+
+    def by_name(self, name):
+        return [self._record(row) for row in self._by_name.get(name, {}).values()]
+
+    def restore(self, db):
+        # Loads a StudentDB into an empty store: snapshot students are indexed
+        # straight from the mapped file, then the change log is replayed on
+        # top. Log entries that no longer make a valid record are skipped.
+        self.journal = None
+        snapshot = db.snapshot()
+        if snapshot is not None:
+            self._snapshot = snapshot
+            self._index_snapshot(snapshot)
+        for entry in db.changes():
+            try:
+                if entry['op'] == 'del':
+                    self.delete(entry['ID'])
+                elif entry['record']['ID'] in self:
+                    self.update(entry['record']['ID'], **entry['record'])
+                else:
+                    self.add(dict(entry['record']))
+            except (KeyError, TypeError, ValueError):
+                continue
+        self.journal = db
+        return self
+
+    def add(self, record):
+        student_id = record['ID']
+        if student_id in self._row_of:
+            raise ValueError(f"Student ID {student_id} already exists")
+        validate_record(record)
+        calculate_marks(record)
+        # Journal first, so a rejected write leaves the store untouched.
+        if self.journal is not None:
+            self.journal.put(record)
+        row = self._next_row
+        self._next_row += 1
+        self._rows[row] = record
+        self._row_of[student_id] = row
+        self._index(row, *self._keys(record))
+        return record
+
+    def update(self, student_id, **fields):
+        record = self.get(student_id)
+        if record is None:
+            raise KeyError(student_id)
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot update {', '.join(sorted(unknown))}")
+        new_id = fields.get('ID', student_id)
+        if new_id != student_id and new_id in self._row_of:
+            raise ValueError(f"Student ID {new_id} already exists")
+
+        updated = validate_record(dict(record, **fields))
+        if any(sub in fields for sub in SUBJECTS):
+            calculate_marks(updated)
+        if self.journal is not None:
+            self.journal.put(updated)
+            if new_id != student_id:
+                self.journal.delete(student_id)
+
+        row = self._row_of[student_id]
+        keys, new_keys = self._keys(record), self._keys(updated)
+        if new_keys[:3] == keys[:3]:
+            # Only marks changed: the Total indexes and aggregates are all that
+            # can move, and an unchanged Total keeps its place among ties.
+            if new_keys[3] != keys[3]:
+                self._move_total(row, keys[2], keys[3], new_keys[3])
+            record.update(updated)
+            return record
+        self._unindex(row, *keys)
+        record.update(updated)
+        if new_id != student_id:
+            self._row_of[new_id] = self._row_of.pop(student_id)
+        self._index(row, *self._keys(record))
+        return record
+
+    def delete(self, student_id):
+        row = self._row_of.pop(student_id, None)
+        if row is None:
+            return None
+        record = self._record(row)
+        del self._rows[row]
+        self._unindex(row, *self._keys(record))
+        if self.journal is not None:
+            self.journal.delete(student_id)
+        return record
+
+    def ordered(self, sort_by=None, section=None, offset=0, limit=None, reverse=False):
+        # One page of students, sorted by Total/Percentage (highest first)
+        # or Name (A-Z), optionally restricted to one section. With no
+        # sort_by, students come back in the order they were added.
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError(f"Invalid page: offset {offset}, limit {limit}")
+        if sort_by is None:
+            source = self._rows if section is None else self._by_section.get(section, {}).values()
+            stop = None if limit is None else offset + limit
+            return [self._record(row) for row in islice(source, offset, stop)]
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Cannot sort by {sort_by}")
+        if section is None:
+            orders = self._orders
+        else:
+            orders = self._section_orders.get(section)
+            if orders is None:
+                return []
+        index = orders['Name' if sort_by == 'Name' else 'Total']
+        return [self._record(row) for row in index.rows(offset, limit, reverse)]
+
+    def rank(self, student_id, within_section=False):
+        # (rank, out_of); students with equal totals share a rank.
+        s = self.get(student_id)
+        if s is None:
+            raise KeyError(student_id)
+        scores = self._scores(s['Section'] if within_section else None)
+        return scores.above(s['Total']) + 1, scores.count
+
+    def percentile(self, student_id, within_section=False):
+        # Percentage of students (overall or in the same section) with a lower total.
+        s = self.get(student_id)
+        if s is None:
+            raise KeyError(student_id)
+        scores = self._scores(s['Section'] if within_section else None)
+        return scores.below(s['Total']) / scores.count * 100
+
+    def top(self, k, section=None):
+        return self.ordered('Total', section, 0, k)
+
+    def between_percentiles(self, low, high, section=None):
+        # Students ranked from the `low`th up to the `high`th percentile
+        # (0 = lowest total, 100 = highest), highest first.
+        scores = self._scores(section)
+        if scores is None:
+            return []
+        n = scores.count
+        start, end = int(n * low / 100), int(n * high / 100)
+        if end <= start:
+            return []
+        return self.ordered('Total', section, n - end, end - start)
+
+    def section_stats(self, section):
+        return self._stats(self._section_totals.get(section, (0, 0)))
+
+    def school_stats(self):
+        return self._stats(self._school_total)
+
+    @staticmethod
+    def _stats(totals):
+        total_sum, count = totals
+        mean = total_sum / count if count else 0.0
+        return {"Sum": total_sum, "Count": count, "Mean": mean,
+                "Percentage": (mean / MAX_TOTAL) * 100}
+
+    def _record(self, row):
+        record = self._rows[row]
+        if type(record) is int:
+            record = self._rows[row] = calculate_marks(self._snapshot[record])
+        return record
+
+    @staticmethod
+    def _keys(record):
+        return record['ID'], record['Name'], record['Section'], record['Total']
+
+    def _scores(self, section=None):
+        # ScoreCounts of the whole school or of one section (None if empty).
+        orders = self._orders if section is None else self._section_orders.get(section)
+        return None if orders is None else orders['Total'].counts
+
+    @staticmethod
+    def _new_orders():
+        return {'Total': TotalIndex(MAX_TOTAL), 'Name': OrderedIndex()}
+
+    def _index(self, row, student_id, name, section, total):
+        self._by_section.setdefault(section, {})[student_id] = row
+        self._by_name.setdefault(name, {})[student_id] = row
+        self._add_total(section, total, 1)
+        section_orders = self._section_orders.get(section)
+        if section_orders is None:
+            section_orders = self._section_orders[section] = self._new_orders()
+        for orders in (self._orders, section_orders):
+            orders['Total'].add(total, row)
+            orders['Name'].add(name, row)
+
+    def _index_snapshot(self, snapshot):
+        # _index() for every snapshot student at once: the keys are read in one
+        # pass, then each ordered index is built in bulk.
+        totals, names, sections = [], [], {}
+        start = self._next_row
+        for row, (student_id, name, section, total) in enumerate(snapshot.keys(), start):
+            self._rows[row] = row - start
+            self._row_of[student_id] = row
+            self._by_section.setdefault(section, {})[student_id] = row
+            self._by_name.setdefault(name, {})[student_id] = row
+            section_keys = sections.get(section)
+            if section_keys is None:
+                section_keys = sections[section] = ([], [])
+            totals.append((total, row))
+            names.append((name, row))
+            section_keys[0].append(totals[-1])
+            section_keys[1].append(names[-1])
+        self._next_row += len(snapshot)
+        for section, (section_totals, section_names) in sections.items():
+            total_sum = sum(total for total, _ in section_totals)
+            for aggregate in (self._section_totals.setdefault(section, [0, 0]), self._school_total):
+                aggregate[0] += total_sum
+                aggregate[1] += len(section_totals)
+            orders = self._section_orders.get(section)
+            if orders is None:
+                orders = self._section_orders[section] = self._new_orders()
+            orders['Total'].extend(section_totals)
+            orders['Name'].extend(section_names)
+        self._orders['Total'].extend(totals)
+        self._orders['Name'].extend(names)
+
+    def _add_total(self, section, total, sign):
+        section_totals = self._section_totals.setdefault(section, [0, 0])
+        for totals in (section_totals, self._school_total):
+            totals[0] += sign * total
+            totals[1] += sign
+        if section_totals[1] == 0:
+            del self._section_totals[section]
+
+    def _move_total(self, row, section, old_total, new_total):
+        self._add_total(section, old_total, -1)
+        self._add_total(section, new_total, 1)
+        for orders in (self._orders, self._section_orders[section]):
+            orders['Total'].remove(old_total, row)
+            orders['Total'].add(new_total, row)
+
+    def _unindex(self, row, student_id, name, section, total):
+        self._add_total(section, total, -1)
+        section_orders = self._section_orders[section]
+        for orders in (self._orders, section_orders):
+            orders['Total'].remove(total, row)
+            orders['Name'].remove(name, row)
+        if not len(section_orders['Total']):
+            del self._section_orders[section]
+        for index, key in ((self._by_section, section), (self._by_name, name)):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(student_id, None)
+                if not bucket:
+                    del index[key]
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "student_data")
+
+_store = None
+
+
+def open_store(directory=DATA_DIR):
+    db = StudentDB(directory)
+    if db.is_empty():
+        from student_seed import students
+        db.compact(students)
+    return StudentStore().restore(db)
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = open_store()
+    return _store
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+import finance_engine as fe
+
+BOUNDARIES = sorted({lower for lower, _ in fe.OLD_REGIME_SLABS + fe.NEW_REGIME_SLABS}
+                    | {fe.OLD_REGIME_REBATE_LIMIT, fe.NEW_REGIME_REBATE_LIMIT})
+
+
+def incomes(deductions=0):
+    # Random incomes plus every slab and rebate boundary (shifted by the
+    # deductions, so the taxable income lands on it) and its neighbours.
+    rnd = random.Random(0)
+    values = [rnd.uniform(0, 6000000) for _ in range(20000)] + [rnd.randrange(0, 6000000) for _ in range(20000)]
+    for boundary in BOUNDARIES:
+        for delta in (-1, -0.01, 0, 0.01, 1):
+            values.append(boundary + deductions + delta)
+    return [max(0, value) for value in values]
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def batch_path(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(fe, "get_numpy", lambda: None)
+    return request.param
+
+
+def test_new_regime_batch_matches_scalar(batch_path):
+    values = incomes()
+    taxes, taxables = fe.calculate_new_regime_tax_batch(values)
+    expected = [fe.calculate_new_regime_tax(value) for value in values]
+    assert [float(tax) for tax in taxes] == [tax for tax, _ in expected]
+    assert [float(taxable) for taxable in taxables] == [taxable for _, taxable in expected]
+
+
+@pytest.mark.parametrize("d80c, d80d", [(0, 0), (150000, 50000), (37500.5, 12000)])
+def test_old_regime_batch_matches_scalar(batch_path, d80c, d80d):
+    values = incomes(d80c + d80d)
+    taxes, taxables = fe.calculate_old_regime_tax_batch(values, d80c, d80d)
+    expected = [fe.calculate_old_regime_tax(value, d80c, d80d) for value in values]
+    assert [float(tax) for tax in taxes] == [tax for tax, _ in expected]
+    assert [float(taxable) for taxable in taxables] == [taxable for _, taxable in expected]
+
+
+def test_old_regime_batch_with_per_employee_deductions(batch_path):
+    rnd = random.Random(1)
+    values = incomes()
+    d80c = [rnd.randrange(0, 150001) for _ in values]
+    d80d = [rnd.randrange(0, 50001) for _ in values]
+    taxes, _ = fe.calculate_old_regime_tax_batch(values, d80c, d80d)
+    assert [float(tax) for tax in taxes] == [fe.calculate_old_regime_tax(v, c, d)[0]
+                                             for v, c, d in zip(values, d80c, d80d)]
+
+
+def test_project_sip_batch_matches_schedule(batch_path):
+    sips, rates, step_ups = [5000, 12000.5, 700], [12, 0, 7.5], [0, 10, 5]
+    corpus, invested = fe.project_sip_batch(sips, rates, 15, step_ups)
+    for i in range(len(sips)):
+        schedule = fe.project_sip(sips[i], rates[i], 15, step_ups[i])
+        assert [float(c) for c in corpus[i]] == pytest.approx([row["corpus"] for row in schedule], rel=1e-12)
+        assert [float(v) for v in invested[i]] == pytest.approx([row["total_invested"] for row in schedule], rel=1e-12)
+
+
+def test_sip_schedule_matches_closed_form():
+    schedule = fe.project_sip(10000, 12, 20)
+    assert schedule[-1]["corpus"] == pytest.approx(fe.calculate_sip_end_value(10000, 12, 20), rel=1e-12)
+    assert fe.project_sip(10000, 0, 3)[-1]["corpus"] == 360000
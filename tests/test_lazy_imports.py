@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", ["finance_engine", "payroll_batch", "regime_optimizer", "sip_simulation",
+                                    "student_columns", "student_db", "student_io", "student_service",
+                                    "student_store"])
+def test_importing_an_engine_does_not_load_numpy(module):
+    code = f"import sys, {module}; sys.exit('numpy' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=ROOT).returncode == 0
@@ -0,0 +1,52 @@
+import csv
+import json
+
+from finance_engine import next_sip_corpus, yearly_summary
+from payroll_batch import project_chunk, read_employees, run_batch
+
+EMPLOYEE = {"employee_id": "E1", "monthly_salary": 150000, "pf_percent": 12, "deductions_80C": 150000,
+            "deductions_80D": 25000, "monthly_sip": 10000, "expected_return_pct": 12,
+            "monthly_expenses": 40000, "hike_pct": "10;5", "years": 4, "sip_step_up_pct": 10}
+
+
+def write_jsonl(path, rows):
+    path.write_text(''.join((row if isinstance(row, str) else json.dumps(row)) + '\n' for row in rows),
+                    encoding='utf-8')
+    return str(path)
+
+
+def test_rows_match_the_yearly_summary(tmp_path):
+    [employee] = read_employees(write_jsonl(tmp_path / "e.jsonl", [EMPLOYEE]))
+    rows = project_chunk([employee])
+    salary, sip, corpus, invested = 150000, 10000, 0.0, 0.0
+    for year, row in enumerate(rows, 1):
+        if year > 1:
+            salary *= 1 + (10 if year == 2 else 5) / 100
+            sip *= 1.10
+        corpus = next_sip_corpus(corpus, sip, 12)
+        invested += sip * 12
+        assert row == {"employee_id": "E1", **yearly_summary(salary, 12, 150000, 25000, 40000, sip, 12, year,
+                                                             corpus, invested)}
+    assert len(rows) == 4
+
+
+def test_bad_rows_are_skipped(tmp_path):
+    path = write_jsonl(tmp_path / "e.jsonl", [EMPLOYEE, "[1, 2]", '"text"', "{broken", {"employee_id": "E2"},
+                                              dict(EMPLOYEE, employee_id="E3", years=1)])
+    errors = []
+    assert [e["employee_id"] for e in read_employees(path, errors)] == ["E1", "E3"]
+    assert [line_no for line_no, _ in errors] == [2, 3, 4, 5]
+
+
+def test_output_does_not_depend_on_workers(tmp_path):
+    employees = [dict(EMPLOYEE, employee_id=f"E{i}", monthly_salary=20000 + 7919 * i, years=1 + i % 5)
+                 for i in range(50)]
+    path = write_jsonl(tmp_path / "e.jsonl", employees)
+    outputs = []
+    for workers, chunk_size in ((1, 1000), (2, 7)):
+        out = str(tmp_path / f"out{workers}.csv")
+        count, errors = run_batch(path, out, workers, chunk_size)
+        assert errors == [] and count == sum(1 + i % 5 for i in range(50))
+        with open(out, newline='', encoding='utf-8') as f:
+            outputs.append(list(csv.reader(f)))
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,75 @@
+import pytest
+
+import finance_engine as fe
+from regime_optimizer import (MAX_80C, MAX_80D, breakeven_incomes, max_taxable_for_tax, new_regime_tax,
+                              old_regime_tax, optimize_regime)
+
+STEP = 1000
+
+
+def scanned_switches(deductions, top=4000000):
+    # Incomes (to within STEP) at which the cheaper regime changes, found by
+    # comparing both taxes on a grid; ties keep the previous answer.
+    switches = []
+    current = 0
+    for income in range(0, top + STEP, STEP):
+        gap = old_regime_tax(income, deductions) - new_regime_tax(income)
+        sign = (gap > 1e-6) - (gap < -1e-6)
+        if sign and sign != current:
+            if current:
+                switches.append(income)
+            current = sign
+    return switches
+
+
+@pytest.mark.parametrize("deductions", [0, 50000, 200000, 375000, 450000, 600000, 800000, 1200000])
+def test_breakeven_incomes_match_a_scan(deductions):
+    switches = breakeven_incomes(deductions)
+    scanned = scanned_switches(deductions)
+    assert len(switches) == len(scanned)
+    for switch, income in zip(switches, scanned):
+        assert income - STEP <= switch < income
+
+
+def test_breakeven_incomes_for_six_lakh_deductions():
+    assert breakeven_incomes(600000) == pytest.approx((1200000, 1675000))
+    assert old_regime_tax(1200000, 600000) > new_regime_tax(1200000)
+    assert old_regime_tax(1200001, 600000) < new_regime_tax(1200001)
+    assert old_regime_tax(1600000, 600000) < new_regime_tax(1600000)
+    assert old_regime_tax(1700000, 600000) > new_regime_tax(1700000)
+
+
+def check_min_deductions(income, needed):
+    new_tax = new_regime_tax(income)
+    assert old_regime_tax(income, needed) <= new_tax + 1e-6
+    if needed >= 1:
+        assert old_regime_tax(income, needed - 1) > new_tax
+
+
+@pytest.mark.parametrize("income", [0, 250000, 500000, 500001, 650000, 699999, 700000])
+def test_min_deductions_for_old(income):
+    result = optimize_regime(income)
+    check_min_deductions(income, result["min_deductions_for_old"])
+
+
+@pytest.mark.parametrize("income", [700001, 900000, 1200000, 1500000, 2500000, 10000000])
+def test_min_deductions_beyond_the_caps(income):
+    assert optimize_regime(income)["min_deductions_for_old"] is None
+    taxable = max_taxable_for_tax(new_regime_tax(income), fe.OLD_REGIME_SLABS, fe.OLD_REGIME_BASES,
+                                  fe.OLD_REGIME_REBATE_LIMIT)
+    needed = income - taxable
+    assert needed > MAX_80C + MAX_80D
+    check_min_deductions(income, needed)
+
+
+@pytest.mark.parametrize("regime", ["old", "new"])
+@pytest.mark.parametrize("target", [0, 1, 5000, 20000, 54600, 100000, 250000, 1000000, 5000000])
+def test_max_taxable_for_tax(regime, target):
+    if regime == "old":
+        tables = fe.OLD_REGIME_SLABS, fe.OLD_REGIME_BASES, fe.OLD_REGIME_REBATE_LIMIT
+    else:
+        tables = fe.NEW_REGIME_SLABS, fe.NEW_REGIME_BASES, fe.NEW_REGIME_REBATE_LIMIT
+    taxable = max_taxable_for_tax(target, *tables)
+    assert taxable >= tables[2]
+    assert fe.calculate_slab_tax(taxable, *tables) <= target + 1e-6
+    assert fe.calculate_slab_tax(taxable + 1, *tables) > target
@@ -0,0 +1,42 @@
+import pytest
+
+import sip_simulation
+from finance_engine import calculate_sip_end_value, project_sip
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(sip_simulation, "get_numpy", lambda: None)
+    return request.param
+
+
+def test_zero_volatility_reproduces_the_calculator(backend):
+    result = sip_simulation.simulate_sip(10000, 12, 0, 10, paths=50, chunk_size=20)
+    expected = calculate_sip_end_value(10000, 12, 10)
+    for key in ("p5", "p50", "p95", "mean"):
+        assert result[key] == pytest.approx(expected, rel=1e-9)
+    stepped = sip_simulation.simulate_sip(10000, 8, 0, 5, paths=10, step_up_pct=10)
+    assert stepped["mean"] == pytest.approx(project_sip(10000, 8, 5, 10)[-1]["corpus"], rel=1e-9)
+
+
+def test_mean_corpus_matches_the_expected_return(backend):
+    paths = 20000 if backend == "numpy" else 3000
+    result = sip_simulation.simulate_sip(10000, 12, 20, 10, paths=paths, seed=7)
+    assert result["mean"] == pytest.approx(calculate_sip_end_value(10000, 12, 10), rel=0.02)
+    assert result["p50"] < result["mean"]
+
+
+def test_results_do_not_depend_on_workers():
+    one = sip_simulation.simulate_sip(5000, 10, 15, 5, paths=3000, chunk_size=1000, workers=1, goal=400000)
+    two = sip_simulation.simulate_sip(5000, 10, 15, 5, paths=3000, chunk_size=1000, workers=2, goal=400000)
+    for key in ("p5", "p50", "p95", "mean", "goal_probability"):
+        assert one[key] == two[key]
+
+
+@pytest.mark.parametrize("kwargs", [{"paths": 0}, {"paths": -5}, {"chunk_size": 0}])
+def test_invalid_sizes_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        sip_simulation.simulate_sip(5000, 10, 15, 5, **kwargs)
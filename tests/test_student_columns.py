@@ -0,0 +1,62 @@
+import math
+import random
+
+import pytest
+
+from student_columns import SUBJECTS, ColumnarStudents
+from student_db import SnapshotReader, write_snapshot
+
+
+def roster(n, sections='ABCD', seed=0):
+    rnd = random.Random(seed)
+    students = []
+    for i in range(n):
+        s = {"Name": f"Student {i}", "ID": f"S{i:05d}", "Section": rnd.choice(sections)}
+        s.update((sub, rnd.randrange(101)) for sub in SUBJECTS)
+        students.append(s)
+    return students
+
+
+def appended(students, use_numpy):
+    columns = ColumnarStudents(capacity=1, use_numpy=use_numpy)
+    for s in students:
+        columns.append(s['ID'], s['Name'], s['Section'], [s[sub] for sub in SUBJECTS])
+    return columns
+
+
+def assert_same(a, b):
+    assert len(a) == len(b)
+    assert a.section_names == b.section_names
+    assert list(a.totals()) == list(b.totals())
+    assert a.section_toppers() == b.section_toppers()
+    assert [a.record(i) for i in range(len(a))] == [b.record(i) for i in range(len(b))]
+    for sub, stats in a.subject_stats().items():
+        for name, value in stats.items():
+            assert math.isclose(value, b.subject_stats()[sub][name])
+
+
+@pytest.mark.parametrize("sections", ['ABCD', [f"X{i}" for i in range(100)]])
+def test_bulk_construction_matches_append(sections):
+    students = roster(500, sections)
+    assert_same(ColumnarStudents.from_records(students, use_numpy=False), appended(students, False))
+    pytest.importorskip("numpy")
+    assert_same(ColumnarStudents.from_records(students, use_numpy=True), appended(students, True))
+    assert_same(ColumnarStudents.from_records(students, use_numpy=True), appended(students, False))
+
+
+def test_from_snapshot(tmp_path):
+    students = roster(300)
+    path = str(tmp_path / "students.snap")
+    write_snapshot(path, students)
+    with SnapshotReader(path) as snapshot:
+        assert_same(ColumnarStudents.from_snapshot(snapshot, use_numpy=False), appended(students, False))
+        pytest.importorskip("numpy")
+        columns = ColumnarStudents.from_snapshot(snapshot, use_numpy=True)
+    assert_same(columns, appended(students, False))
+    columns.append("NEW", "New Student", "Z", [1, 2, 3, 4, 5])
+    assert columns.record(300)['Total'] == 15
+
+
+def test_mismatched_columns_are_rejected():
+    with pytest.raises(ValueError):
+        ColumnarStudents.from_arrays(["S1"], ["A"], ["A", "B"], [1, 2, 3, 4, 5], use_numpy=False)
@@ -0,0 +1,138 @@
+import gc
+import json
+
+import pytest
+
+from student_db import SnapshotReader, StudentDB, write_snapshot
+from student_index import OrderedIndex
+from student_store import StudentStore, open_store
+
+
+def student(student_id, name="Test Student", section="A", marks=(50, 60, 70, 80, 90)):
+    s = {"Name": name, "ID": student_id, "Section": section}
+    s.update(zip(('Sub1', 'Sub2', 'Sub3', 'Sub4', 'Sub5'), marks))
+    return s
+
+
+def test_round_trip_through_snapshot_and_log(tmp_path):
+    store = open_store(str(tmp_path))
+    store.add(student("X1"))
+    store.update("S001", Name="Renamed", Sub1=1)
+    store.delete("S002")
+    store.journal.compact()
+    store.add(student("X2", section="B"))
+    store.update("S003", ID="S003B")
+    expected = sorted((s['ID'], s['Name'], s['Total']) for s in store)
+    store.journal.close()
+
+    reloaded = open_store(str(tmp_path))
+    assert sorted((s['ID'], s['Name'], s['Total']) for s in reloaded) == expected
+    assert reloaded.get("S002") is None and reloaded.get("S003") is None
+    reloaded.journal.close()
+
+
+def test_restore_decodes_records_on_demand(tmp_path):
+    db = StudentDB(str(tmp_path))
+    db.compact([student(f"S{i}", marks=(i, i, i, i, i)) for i in range(10)])
+    store = StudentStore().restore(db)
+    assert len(store) == 10
+    assert all(type(record) is int for record in store._rows.values())
+    assert [s['ID'] for s in store.top(2)] == ["S9", "S8"]
+    assert store.get("S9")['Total'] == 45
+    assert sum(type(record) is int for record in store._rows.values()) == 8
+    db.close()
+
+
+def test_restore_builds_the_same_indexes_as_adding(tmp_path, monkeypatch):
+    monkeypatch.setattr(OrderedIndex, 'BLOCK_SIZE', 4)
+    records = [student(f"S{i:02d}", name=f"N{i % 7}", section="ABC"[i % 3], marks=(i % 5, i % 11, 3, 4, 5))
+               for i in range(40)]
+    db = StudentDB(str(tmp_path))
+    db.compact(records)
+    restored = StudentStore().restore(db)
+    added = StudentStore(dict(s) for s in records)
+
+    def views(store):
+        return [[s['ID'] for s in store.ordered(key, section, 3, 20, reverse)]
+                for key in ('Total', 'Name', None) for section in (None, "A", "B")
+                for reverse in (False, True)]
+
+    assert views(restored) == views(added)
+    assert [restored.section_stats(x) for x in "ABC"] == [added.section_stats(x) for x in "ABC"]
+    assert restored.school_stats() == added.school_stats()
+    assert [restored.rank(s['ID'], True) for s in records] == [added.rank(s['ID'], True) for s in records]
+    for store in (restored, added):
+        store.add(student("X1", name="N3", marks=(9, 9, 9, 9, 9)))
+        store.delete("S05")
+    assert views(restored) == views(added)
+    db.close()
+
+
+def test_compaction_keeps_the_order_load_returns(tmp_path):
+    db = StudentDB(str(tmp_path))
+    db.compact([student(f"S{i}") for i in range(5)])
+    db.put(student("S1", name="Renamed"))
+    db.delete("S2")
+    db.put(student("X1"))
+    db.delete("S3")
+    db.put(student("S3", marks=(1, 2, 3, 4, 5)))
+    db.put(student("S1", marks=(0, 0, 0, 0, 0)))
+    db.delete("X1")
+    db.put(student("X2"))
+    expected = db.load()
+    db.compact()
+    assert db.log_entries == 0
+    assert db.load() == expected
+    assert [s['ID'] for s in expected] == ["S0", "S1", "S4", "S3", "X2"]
+    db.close()
+
+
+def test_torn_last_line_does_not_swallow_later_writes(tmp_path):
+    db = StudentDB(str(tmp_path))
+    db.put(student("X1"))
+    db.close()
+    with open(db.log_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "put", "record": {"Na')
+
+    db = StudentDB(str(tmp_path))
+    db.put(student("X2"))
+    db.put(student("X3"))
+    db.close()
+    assert [s['ID'] for s in StudentDB(str(tmp_path)).load()] == ["X1", "X2", "X3"]
+
+
+def test_damaged_line_in_the_middle_is_skipped(tmp_path):
+    db = StudentDB(str(tmp_path))
+    db.put(student("X1"))
+    db._log.write('not json\n[1, 2]\n')
+    db.put(student("X2"))
+    db.close()
+    db = StudentDB(str(tmp_path))
+    assert db.log_entries == 2
+    assert [s['ID'] for s in db.load()] == ["X1", "X2"]
+
+
+def test_numpy_view_survives_close(tmp_path):
+    pytest.importorskip("numpy")
+    path = str(tmp_path / "students.snap")
+    write_snapshot(path, [student("S1"), student("S2", marks=(1, 2, 3, 4, 5))])
+    with SnapshotReader(path) as snapshot:
+        view = snapshot.as_numpy()
+    assert view['ID'].tolist() == [b"S1", b"S2"]
+    assert view['Marks'][1].tolist() == [1, 2, 3, 4, 5]
+    del view
+    gc.collect()
+
+
+def test_invalid_log_entries_are_skipped_on_restore(tmp_path):
+    store = open_store(str(tmp_path))
+    store.journal.close()
+    bad = dict(student("S001"), Name=123)
+    with open(StudentDB(str(tmp_path)).log_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"op": "put", "record": bad}) + '\n')
+        f.write(json.dumps({"op": "put", "record": dict(student("X1"), Sub1=50.5)}) + '\n')
+        f.write(json.dumps({"op": "put", "record": student("X2")}) + '\n')
+    reopened = open_store(str(tmp_path))
+    assert len(reopened) == 101 and len(reopened.ordered('Name')) == 101
+    assert reopened.get("S001")['Name'] == "Aarav Sharma" and "X1" not in reopened and "X2" in reopened
+    reopened.journal.close()
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from student_db import StudentDB
+from student_io import export_students, import_students, validate_row
+from student_store import StudentStore
+
+
+def row(**marks):
+    r = {"Name": "Test Student", "ID": "S1", "Section": "A", "Sub1": 50, "Sub2": 60, "Sub3": 70, "Sub4": 80, "Sub5": 90}
+    r.update(marks)
+    return r
+
+
+@pytest.mark.parametrize("value, expected", [(50, 50), (50.0, 50), ("50", 50), (" 7 ", 7), (0, 0), (100, 100)])
+def test_valid_marks(value, expected):
+    assert validate_row(row(Sub1=value))['Sub1'] == expected
+
+
+@pytest.mark.parametrize("value", [1.9, True, False, "1.9", "", None, [50], 101, -1, float('nan')])
+def test_invalid_marks_are_rejected(value):
+    with pytest.raises(ValueError):
+        validate_row(row(Sub1=value))
+
+
+def test_import_reports_bad_rows_and_skips_them(tmp_path):
+    path = tmp_path / "students.jsonl"
+    lines = [row(ID="S1"), row(ID="S2", Sub1=1.9), row(ID="S3", Sub2=True), row(ID="S1"), [1, 2], row(ID="S4")]
+    path.write_text(''.join(json.dumps(line) + '\n' for line in lines) + 'not json\n', encoding='utf-8')
+    store = StudentStore()
+    report = import_students(str(path), store)
+    assert report["imported"] == 2 and report["rejected"] == 5
+    assert [line_no for line_no, _ in report["errors"]] == [2, 3, 4, 5, 7]
+    assert sorted(s['ID'] for s in store) == ["S1", "S4"]
+
+
+@pytest.mark.parametrize("suffix", ["csv", "jsonl"])
+def test_export_then_import_round_trip(tmp_path, suffix):
+    store = StudentStore([validate_row(row(ID=f"S{i}", Sub1=i)) for i in range(20)])
+    path = str(tmp_path / f"students.{suffix}")
+    assert export_students(store, path) == 20
+    copy = StudentStore()
+    assert import_students(path, copy)["imported"] == 20
+    assert [(s['ID'], s['Total']) for s in copy] == [(s['ID'], s['Total']) for s in store]
+
+
+def test_export_does_not_keep_snapshot_students_decoded(tmp_path):
+    db = StudentDB(str(tmp_path / "db"))
+    db.compact([validate_row(row(ID=f"S{i}", Sub1=i)) for i in range(5)])
+    store = StudentStore().restore(db)
+    assert export_students(store, str(tmp_path / "students.csv")) == 5
+    assert all(type(record) is int for record in store._rows.values())
+    db.close()
@@ -0,0 +1,136 @@
+import asyncio
+import json
+
+import pytest
+
+from student_service import StudentService
+from student_store import open_store
+
+
+async def call(reader, writer, request):
+    writer.write((json.dumps(request) + "\n").encode())
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+def run_session(store, requests):
+    async def session():
+        async with StudentService(store) as service:
+            server = await asyncio.start_server(service.handle_client, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                responses = [await call(reader, writer, request) for request in requests]
+                writer.close()
+                return responses
+    return asyncio.run(session())
+
+
+def indexed_names(store):
+    return len(store.ordered('Name'))
+
+
+def test_bad_updates_are_rejected_without_touching_the_store(tmp_path):
+    store = open_store(str(tmp_path))
+    before = dict(store.get("S001"))
+    responses = run_session(store, [
+        {"op": "update_student", "student_id": "S001", "fields": {"Sub1": 50.5}},
+        {"op": "update_student", "student_id": "S001", "fields": {"Sub1": True}},
+        {"op": "update_student", "student_id": "S001", "fields": {"Name": ""}},
+        {"op": "update_student", "student_id": "S001", "fields": {"Name": "x" * 100}},
+        {"op": "update_student", "student_id": "S001", "fields": {"Total": 500}},
+        {"op": "update_student", "student_id": "S001", "fields": [1]},
+        {"op": "update_student", "student_id": "NOPE", "fields": {"Sub1": 5}},
+        {"op": "update_student", "student_id": "S001", "fields": {"Name": 123, "Sub2": "40"}},
+        {"op": "search_student", "student_id": "S001"},
+    ])
+    assert [r["ok"] for r in responses] == [False] * 7 + [True, True]
+    assert responses[-1]["result"]["Name"] == "123" and responses[-1]["result"]["Sub2"] == 40
+    assert {k: v for k, v in store.get("S001").items() if k not in ("Name", "Sub2", "Total", "Percentage")} == \
+        {k: v for k, v in before.items() if k not in ("Name", "Sub2", "Total", "Percentage")}
+    assert indexed_names(store) == len(store) == 100
+    store.journal.close()
+
+    reopened = open_store(str(tmp_path))
+    assert reopened.get("S001")["Name"] == "123" and indexed_names(reopened) == 100
+    reopened.journal.close()
+
+
+def test_store_checks_fields_before_journaling(tmp_path):
+    store = open_store(str(tmp_path))
+    entries = store.journal.log_entries
+    for fields in ({"Name": 123}, {"Sub1": 50.5}, {"Section": None}, {"ID": 7}, {"Sub3": 101}, {"Total": 1}):
+        with pytest.raises(ValueError):
+            store.update("S001", **fields)
+    with pytest.raises(ValueError):
+        store.add({"Name": ["x"], "ID": "NEW", "Section": "A", "Sub1": 1, "Sub2": 2, "Sub3": 3, "Sub4": 4, "Sub5": 5})
+    assert store.journal.log_entries == entries
+    assert indexed_names(store) == len(store) == 100
+    store.journal.close()
+
+
+def test_storage_errors_become_error_responses(tmp_path):
+    store = open_store(str(tmp_path))
+
+    def failing_put(record):
+        raise OSError("disk full")
+
+    store.journal.put = failing_put
+    responses = run_session(store, [
+        {"op": "update_student", "student_id": "S001", "fields": {"Sub1": 1}},
+        {"op": "search_student", "student_id": "S001"},
+    ])
+    assert responses[0] == {"ok": False, "error": "OSError: disk full"}
+    assert responses[1]["ok"] and responses[1]["result"]["Sub1"] == 78
+    store.journal.close()
+
+
+def test_concurrent_writes_are_batched(tmp_path):
+    store = open_store(str(tmp_path))
+    flushes = []
+    sync = store.journal._sync
+    store.journal._sync = lambda: (flushes.append(1), sync())
+
+    async def main():
+        async with StudentService(store) as service:
+            adds = [service.add_student({"Name": f"N{i}", "ID": f"X{i}", "Section": "A", "Sub1": 1, "Sub2": 2,
+                                         "Sub3": 3, "Sub4": 4, "Sub5": 5}) for i in range(300)]
+            return await asyncio.gather(*adds)
+
+    assert len(asyncio.run(main())) == 300
+    assert len(store) == 400 and len(flushes) < 30
+    store.journal.close()
+
+
+def test_failed_flush_leaves_store_and_log_unchanged(tmp_path):
+    store = open_store(str(tmp_path))
+    s1, s2 = dict(store.get("S001")), dict(store.get("S002"))
+    stats = store.school_stats()
+    sync = store.journal._sync
+
+    def failing_sync():
+        raise OSError("disk full")
+
+    async def main():
+        async with StudentService(store) as service:
+            return await asyncio.gather(
+                service.add_student({"Name": "N", "ID": "X1", "Section": "A", "Sub1": 1, "Sub2": 2, "Sub3": 3,
+                                     "Sub4": 4, "Sub5": 5}),
+                service.update_student("S001", {"ID": "S001B", "Name": "Renamed", "Sub1": 1}),
+                service.delete_student("S002"),
+                return_exceptions=True)
+
+    store.journal._sync = failing_sync
+    assert all(isinstance(result, OSError) for result in asyncio.run(main()))
+    assert "X1" not in store and "S001B" not in store
+    assert store.get("S001") == s1 and store.get("S002") == s2
+    assert indexed_names(store) == len(store) == 100
+    assert store.school_stats() == stats
+
+    store.journal._sync = sync
+    store.update("S003", Sub1=0)
+    store.journal.close()
+    reopened = open_store(str(tmp_path))
+    assert "X1" not in reopened and reopened.get("S001") == s1 and reopened.get("S002") == s2
+    assert reopened.get("S003")["Sub1"] == 0
+    reopened.journal.close()
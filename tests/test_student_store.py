@@ -0,0 +1,158 @@
+import random
+
+import pytest
+
+from student_index import OrderedIndex, ScoreCounts, TotalIndex
+from student_store import SUBJECTS, StudentStore
+
+SECTIONS = 'ABC'
+NAMES = ('Asha', 'Bala', 'Chitra', 'Dev', 'Esha')
+
+
+def new_student(rnd, student_id):
+    s = {"Name": rnd.choice(NAMES), "ID": student_id, "Section": rnd.choice(SECTIONS)}
+    s.update((sub, rnd.choice((0, 10, 50, 90, 100))) for sub in SUBJECTS)
+    return s
+
+
+class Model:
+    # Brute-force reference: students are re-sorted for every query. `row`
+    # is fixed when a student is added; `stamp` changes whenever any indexed
+    # field does, which is when the store moves a student to the end of its ties.
+    def __init__(self):
+        self.students = {}
+        self.clock = 0
+
+    def tick(self):
+        self.clock += 1
+        return self.clock
+
+    def add(self, s):
+        self.students[s['ID']] = dict(s, Total=sum(s[sub] for sub in SUBJECTS), row=self.tick(), stamp=self.clock)
+
+    def update(self, student_id, fields):
+        old = self.students.pop(student_id)
+        new = dict(old, **fields)
+        new['Total'] = sum(new[sub] for sub in SUBJECTS)
+        if any(new[k] != old[k] for k in ('ID', 'Name', 'Section', 'Total')):
+            new['stamp'] = self.tick()
+        self.students[new['ID']] = new
+
+    def in_section(self, section):
+        return [s for s in self.students.values() if section is None or s['Section'] == section]
+
+    def ordered(self, sort_by, section):
+        students = self.in_section(section)
+        if sort_by == 'Name':
+            students.sort(key=lambda s: (s['Name'], s['row']))
+        else:
+            students.sort(key=lambda s: (-s['Total'], s['stamp']))
+        return [s['ID'] for s in students]
+
+
+def check(store, model, rnd):
+    assert len(store) == len(model.students)
+    assert sorted(s['ID'] for s in store) == sorted(model.students)
+    for section in (None,) + tuple(SECTIONS):
+        expected_students = model.in_section(section)
+        for sort_by in ('Total', 'Name'):
+            expected = model.ordered(sort_by, section)
+            assert [s['ID'] for s in store.ordered(sort_by, section)] == expected
+            assert [s['ID'] for s in store.ordered(sort_by, section, reverse=True)] == expected[::-1]
+            offset, limit = rnd.randrange(len(expected) + 2), rnd.randrange(1, 8)
+            assert [s['ID'] for s in store.ordered(sort_by, section, offset, limit)] == expected[offset:offset + limit]
+            assert ([s['ID'] for s in store.ordered(sort_by, section, offset, limit, reverse=True)]
+                    == expected[::-1][offset:offset + limit])
+        totals = [s['Total'] for s in expected_students]
+        stats = store.school_stats() if section is None else store.section_stats(section)
+        assert (stats['Sum'], stats['Count']) == (sum(totals), len(totals))
+        if section is not None:
+            assert sorted(s['ID'] for s in store.by_section(section)) == sorted(s['ID'] for s in expected_students)
+    for name in NAMES:
+        assert (sorted(s['ID'] for s in store.by_name(name))
+                == sorted(i for i, s in model.students.items() if s['Name'] == name))
+    for student_id, s in rnd.sample(sorted(model.students.items()), min(5, len(model.students))):
+        everyone = [m['Total'] for m in model.students.values()]
+        assert store.rank(student_id) == (sum(t > s['Total'] for t in everyone) + 1, len(everyone))
+        assert store.percentile(student_id) == sum(t < s['Total'] for t in everyone) / len(everyone) * 100
+        section = [m['Total'] for m in model.in_section(s['Section'])]
+        assert store.rank(student_id, within_section=True) == (sum(t > s['Total'] for t in section) + 1,
+                                                                len(section))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_indexes_match_brute_force(seed, monkeypatch):
+    monkeypatch.setattr(OrderedIndex, 'BLOCK_SIZE', 3)
+    rnd = random.Random(seed)
+    store, model = StudentStore(), Model()
+    next_id = 0
+    for step in range(400):
+        op = rnd.random()
+        ids = sorted(model.students)
+        if op < 0.4 or not ids:
+            s = new_student(rnd, f"S{next_id}")
+            next_id += 1
+            store.add(dict(s))
+            model.add(s)
+        elif op < 0.75:
+            student_id = rnd.choice(ids)
+            field = rnd.choice(('Name', 'Section', 'ID', 'marks', 'same'))
+            if field == 'marks':
+                fields = {rnd.choice(SUBJECTS): rnd.choice((0, 10, 50, 90, 100))}
+            elif field == 'ID':
+                fields = {'ID': f"S{next_id}"}
+                next_id += 1
+            elif field == 'same':
+                fields = {'Sub1': model.students[student_id]['Sub1']}
+            else:
+                fields = {field: new_student(rnd, student_id)[field]}
+            store.update(student_id, **fields)
+            model.update(student_id, fields)
+        else:
+            student_id = rnd.choice(ids)
+            assert store.delete(student_id)['ID'] == student_id
+            del model.students[student_id]
+        if step % 20 == 0:
+            check(store, model, rnd)
+    check(store, model, rnd)
+
+
+def test_top_and_percentile_bands():
+    store = StudentStore()
+    for i in range(10):
+        store.add({"Name": f"N{i}", "ID": f"S{i}", "Section": "A", **{sub: i * 10 for sub in SUBJECTS}})
+    assert [s['ID'] for s in store.top(3)] == ["S9", "S8", "S7"]
+    assert [s['ID'] for s in store.between_percentiles(0, 20)] == ["S1", "S0"]
+    assert [s['ID'] for s in store.between_percentiles(80, 100)] == ["S9", "S8"]
+    assert store.ordered('Total', 'B') == [] and store.between_percentiles(0, 100, 'B') == []
+
+
+@pytest.mark.parametrize("sort_by", [None, 'Total', 'Name'])
+@pytest.mark.parametrize("section", [None, 'A', 'B'])
+def test_negative_page_is_rejected(sort_by, section):
+    store = StudentStore([{"Name": "N", "ID": "S1", "Section": "A", **{sub: 1 for sub in SUBJECTS}}])
+    with pytest.raises(ValueError):
+        store.ordered(sort_by, section, 0, -5)
+    with pytest.raises(ValueError):
+        store.ordered(sort_by, section, -1, 5)
+
+
+def test_score_counts_find():
+    rnd = random.Random(1)
+    counts = ScoreCounts(500)
+    scores = sorted(rnd.randrange(501) for _ in range(300))
+    for score in scores:
+        counts.add(score)
+    assert [counts.find(k) for k in range(len(scores))] == scores
+
+
+def test_total_index_pages():
+    index = TotalIndex(10)
+    for row, total in enumerate([5, 7, 5, 0, 10, 7, 5]):
+        index.add(total, row)
+    index.remove(5, 2)
+    index.remove(5, 99)
+    assert index.rows() == [4, 1, 5, 0, 6, 3]
+    assert index.rows(2, 3) == [5, 0, 6]
+    assert index.rows(1, 2, reverse=True) == [6, 0]
+    assert index.rows(6) == [] and len(index) == 6